@@ -4,6 +4,7 @@ PyMuPDF, OpenCV, Tesseract를 활용한 향상된 이미지 분석 및 텍스트
 """
 import os
 import time
+import asyncio
 import tempfile
 import logging
 from typing import List, Dict, Any, Optional
@@ -12,6 +13,9 @@ from services.advanced_image_service import AdvancedImageService, ImageQuality,
 
 logger = logging.getLogger(__name__)
 
+# 동시에 분석(디코딩/OCR)할 최대 이미지 수
+MAX_CONCURRENT_IMAGE_ANALYSIS = 4
+
 try:
     import fitz  # PyMuPDF (이미지 추출용)
     PYMUPDF_AVAILABLE = True
@@ -32,14 +36,14 @@ except ImportError:
 class ImageProcessorAgent(BaseAgent):
     """고급 이미지 OCR 처리 에이전트"""
     
-    def __init__(self):
+    def __init__(self, use_ocr_cache: bool = False):
         super().__init__(
             name="image_processor", 
             description="PDF 내 이미지에서 고급 분석과 OCR을 통해 텍스트를 추출하고 메타데이터를 보존합니다"
         )
         
         # 고급 이미지 서비스 초기화
-        self.image_service = AdvancedImageService()
+        self.image_service = AdvancedImageService(use_ocr_cache=use_ocr_cache)
         
         # 처리 통계
         self.processing_stats = {
@@ -63,22 +67,41 @@ class ImageProcessorAgent(BaseAgent):
             
             # 1. 향상된 메타데이터와 함께 이미지 추출
             self.log_step(state, "이미지 메타데이터 추출 중...")
-            image_metadata_list = self.image_service.extract_images_with_metadata(file_path)
+            image_metadata_list = await asyncio.to_thread(
+                self.image_service.extract_images_with_metadata, file_path
+            )
             self.processing_stats["total_images"] = len(image_metadata_list)
             
             # 2. 각 이미지에 대해 종합적 분석 수행
-            image_analysis_results = []
             successful_ocr_count = 0
             high_quality_count = 0
             total_text_regions = 0
             
-            for metadata in image_metadata_list:
-                self.log_step(state, f"이미지 분석 중: 페이지 {metadata.page_number}, 인덱스 {metadata.image_index}")
-                
-                # 종합적 이미지 분석
-                analysis_result = self.image_service.analyze_image_comprehensive(metadata, file_path)
-                image_analysis_results.append(analysis_result)
-                
+            # PyMuPDF는 멀티스레드를 지원하지 않으므로 원본 바이트는 전역 fitz 락(FITZ_LOCK) 안에서 한 번에 추출
+            image_bytes_by_xref = await asyncio.to_thread(
+                self.image_service.extract_image_bytes,
+                file_path,
+                [metadata.xref for metadata in image_metadata_list]
+            )
+            
+            # 디코딩/OCR만 스레드 풀로 분산 (세마포어로 동시 실행 수 제한)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_IMAGE_ANALYSIS)
+            
+            async def analyze(metadata):
+                async with semaphore:
+                    self.log_step(state, f"이미지 분석 중: 페이지 {metadata.page_number}, 인덱스 {metadata.image_index}")
+                    return await asyncio.to_thread(
+                        self.image_service.analyze_image_comprehensive,
+                        metadata,
+                        file_path,
+                        image_bytes_by_xref.get(metadata.xref, b"")
+                    )
+            
+            image_analysis_results = await asyncio.gather(*(
+                analyze(metadata) for metadata in image_metadata_list
+            ))
+            
+            for analysis_result in image_analysis_results:
                 # 통계 업데이트
                 if analysis_result.ocr_text.strip():
                     successful_ocr_count += 1
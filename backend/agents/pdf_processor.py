@@ -5,8 +5,10 @@ PyMuPDF를 사용하여 PDF 메타데이터 및 고급 구조 분석
 """
 import os
 import time
+import asyncio
 from typing import Dict, Any, Optional
 from .base import BaseAgent, DocumentProcessingState, ProcessingStatus
+from services.pdf_lock import FITZ_LOCK
 
 try:
     import fitz  # PyMuPDF
@@ -72,7 +74,10 @@ class PDFProcessorAgent(BaseAgent):
             if self.quality_analyzer:
                 self.log_step(state, "고급 구조 분석 수행 중...")
                 try:
-                    advanced_analysis = self.quality_analyzer.analyze_document_structure(file_path)
+                    # fitz 전역 락을 기다리는 동안 이벤트 루프가 막히지 않도록 스레드에서 실행
+                    advanced_analysis = await asyncio.to_thread(
+                        self.quality_analyzer.analyze_document_structure, file_path
+                    )
                     if advanced_analysis.get("error"):
                         self.log_step(state, f"고급 분석 실패: {advanced_analysis['error']}", "warning")
                         advanced_analysis = {}
@@ -120,6 +125,15 @@ class PDFProcessorAgent(BaseAgent):
             
             state["raw_content"] = raw_content
             
+            # fitz 호출은 전역 락 안에서 수행 (락 대기로 이벤트 루프가 막히지 않도록 스레드에서 실행)
+            return await asyncio.to_thread(self._read_basic_metadata, file_path, len(raw_content))
+            
+        except Exception as e:
+            return {"error": f"기본 PDF 분석 실패: {str(e)}"}
+    
+    def _read_basic_metadata(self, file_path: str, file_size: int) -> Dict[str, Any]:
+        """PyMuPDF로 메타데이터와 페이지별 구조 추출 (FITZ_LOCK 보유)"""
+        with FITZ_LOCK:
             # PyMuPDF로 PDF 문서 열기
             pdf_document = fitz.open(file_path)
             
@@ -133,23 +147,23 @@ class PDFProcessorAgent(BaseAgent):
                 "creation_date": pdf_document.metadata.get("creationDate", ""),
                 "modification_date": pdf_document.metadata.get("modDate", ""),
                 "total_pages": pdf_document.page_count,
-                "file_size": len(raw_content),
+                "file_size": file_size,
                 "encrypted": pdf_document.is_encrypted,
                 "needs_pass": pdf_document.needs_pass
             }
-            
+        
             # 페이지별 구조 분석
             pages_info = []
             total_text_chars = 0
             total_images = 0
-            
+        
             for page_num in range(pdf_document.page_count):
                 page = pdf_document[page_num]
                 page_text = page.get_text()
                 total_text_chars += len(page_text)
                 page_images = page.get_images()
                 total_images += len(page_images)
-                
+            
                 page_info = {
                     "page_number": page_num + 1,
                     "width": page.rect.width,
@@ -163,19 +177,16 @@ class PDFProcessorAgent(BaseAgent):
                     "text_length": len(page_text)
                 }
                 pages_info.append(page_info)
-            
+        
             basic_metadata.update({
                 "pages_info": pages_info,
                 "total_text_chars": total_text_chars,
                 "total_images": total_images,
                 "avg_text_per_page": total_text_chars / pdf_document.page_count if pdf_document.page_count > 0 else 0
             })
-            
+        
             pdf_document.close()
             return basic_metadata
-            
-        except Exception as e:
-            return {"error": f"기본 PDF 분석 실패: {str(e)}"}
     
     def _integrate_analysis_results(self, basic: Dict[str, Any], advanced: Dict[str, Any]) -> Dict[str, Any]:
         """기본 분석과 고급 분석 결과를 통합"""
@@ -285,14 +296,15 @@ class PDFProcessorAgent(BaseAgent):
             return None
             
         try:
-            doc = fitz.open(file_path)
-            info = {
-                "page_count": doc.page_count,
-                "file_size": os.path.getsize(file_path),
-                "title": doc.metadata.get("title", ""),
-                "encrypted": doc.is_encrypted
-            }
-            doc.close()
+            with FITZ_LOCK:
+                doc = fitz.open(file_path)
+                info = {
+                    "page_count": doc.page_count,
+                    "file_size": os.path.getsize(file_path),
+                    "title": doc.metadata.get("title", ""),
+                    "encrypted": doc.is_encrypted
+                }
+                doc.close()
             return info
         except Exception as e:
             print(f"PDF 정보 조회 실패: {e}")
@@ -34,6 +34,7 @@ class ProcessedQuery:
     confidence: float
     entity_types: Dict[str, List[str]]
     query_type: str
+    embedding: Optional[List[float]] = None  # L2 정규화된 질의 임베딩 (검색 엔진이 최초 검색 시 채움)
 
 class InsuranceQueryProcessor:
     """보험 도메인 특화 자연어 질의 전처리기"""
@@ -0,0 +1,90 @@
+"""
+pytest 공용 설정
+스크립트형 테스트(test_api / test_chunking_service / test_db_connection_simple)를
+pytest(-n auto)로도 실행할 수 있도록 세션 단위 이벤트 루프와 공유 핸들을 제공합니다.
+
+    pytest -n auto test_api.py test_chunking_service.py test_db_connection_simple.py
+"""
+import asyncio
+import importlib.util
+import inspect
+
+import pytest
+
+# 모듈 최상위에서 LangFuse SDK를 불러와 바로 실행되는 스크립트는 수집하지 않음 (python으로 직접 실행)
+collect_ignore = ["test_langfuse_basic.py", "test_langfuse_simple.py"]
+
+# LangFuse SDK가 없으면 통합 테스트도 수집 대상에서 제외 (SDK import 없이 존재 여부만 확인)
+if importlib.util.find_spec("langfuse") is None:
+    collect_ignore.append("test_langfuse_integration.py")
+
+# 이 훅으로 실행하는 스크립트형 테스트 모듈 (나머지 모듈은 pytest 기본 동작 유지)
+SCRIPT_TEST_MODULES = {
+    "test_api",
+    "test_chunking_service",
+    "test_db_connection_simple",
+}
+
+
+@pytest.fixture(scope="session")
+def session_loop():
+    """세션 전체에서 공유하는 이벤트 루프 (클라이언트/DB 엔진을 테스트 간 재사용)"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def client(session_loop):
+    """공유 HTTP 클라이언트 (서버가 실행 중이 아니면 API 테스트 건너뜀)"""
+    import httpx
+    from test_api import BASE_URL, CLIENT_LIMITS, CLIENT_HEADERS
+
+    http_client = httpx.AsyncClient(limits=CLIENT_LIMITS, headers=CLIENT_HEADERS)
+    try:
+        session_loop.run_until_complete(http_client.get(f"{BASE_URL}/health", timeout=5))
+    except httpx.HTTPError as e:
+        session_loop.run_until_complete(http_client.aclose())
+        pytest.skip(f"API 서버에 연결할 수 없습니다: {e}")
+
+    yield http_client
+    session_loop.run_until_complete(http_client.aclose())
+
+
+@pytest.fixture(scope="session")
+def token(session_loop, client):
+    """인증 토큰 (디스크 캐시 재사용, 필요 시에만 로그인)"""
+    from test_api import get_token
+    return session_loop.run_until_complete(get_token(client))
+
+
+def _is_script_test(item) -> bool:
+    """SCRIPT_TEST_MODULES에 속한 테스트인지 확인"""
+    return item.module.__name__.rsplit(".", 1)[-1] in SCRIPT_TEST_MODULES
+
+
+def pytest_collectstart(collector):
+    """스크립트형 테스트 모듈에 세션 루프 fixture 연결 (테스트 함수 시그니처는 그대로 유지)"""
+    if isinstance(collector, pytest.Module) and collector.path.stem in SCRIPT_TEST_MODULES:
+        collector.add_marker(pytest.mark.usefixtures("session_loop"))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """스크립트형 테스트 실행: 코루틴은 세션 루프에서 실행하고 False/None 반환은 실패로 처리"""
+    if not _is_script_test(pyfuncitem):
+        return None
+
+    test_function = pyfuncitem.obj
+    params = inspect.signature(test_function).parameters
+    kwargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem.fixturenames if name in params}
+
+    if inspect.iscoroutinefunction(test_function):
+        session_loop = pyfuncitem.funcargs["session_loop"]
+        result = session_loop.run_until_complete(test_function(**kwargs))
+    else:
+        result = test_function(**kwargs)
+
+    if not result:
+        pytest.fail(f"{pyfuncitem.name}이(가) 실패를 반환했습니다: {result!r}")
+    return True
@@ -16,6 +16,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -161,6 +162,54 @@ async def root():
         "status": "running"
     }
 
+# 통합 셀프테스트 엔드포인트 (DEBUG_SELFTEST=true로 명시적으로 켠 경우에만 등록, 인증 필요)
+if os.getenv("DEBUG_SELFTEST", "False").lower() == "true":
+    from fastapi import Depends
+    from routers.workflow import verify_token as workflow_verify_token
+
+    @app.get("/debug/selftest")
+    async def debug_selftest(current_user: dict = Depends(workflow_verify_token)):
+        """헬스체크/루트/약관/검색/워크플로우 로그를 프로세스 내에서 한 번에 점검"""
+        from routers.policies import get_policies
+        from routers.search import search_policies, SearchRequest
+        from routers.workflow import get_workflow_logs
+
+        health, root_info, policies, search_response, logs = await asyncio.gather(
+            health_check(),
+            root(),
+            get_policies(skip=0, limit=100),
+            search_policies(SearchRequest(query="건강보험 보장범위", limit=5)),
+            get_workflow_logs(workflow_id=None, current_user=current_user),
+            return_exceptions=True
+        )
+
+        errors = {
+            name: str(value)
+            for name, value in (
+                ("health", health), ("root", root_info), ("policies", policies),
+                ("search", search_response), ("workflow", logs)
+            )
+            if isinstance(value, BaseException)
+        }
+        if errors:
+            logger.warning(f"셀프테스트 일부 실패: {errors}")
+
+        workflow_head = None
+        if "workflow" not in errors and logs:
+            workflow_head = {
+                "step_name": logs[0].get("step_name"),
+                "status": logs[0].get("status")
+            }
+
+        return {
+            "health": None if "health" in errors else health,
+            "root": None if "root" in errors else root_info,
+            "policies_count": None if "policies" in errors else len(policies),
+            "search_ok": "search" not in errors and bool(search_response.answer),
+            "workflow_head": workflow_head,
+            "errors": errors
+        }
+
 if __name__ == "__main__":
     # 환경 변수에서 로그 레벨 가져오기
     uvicorn_log_level = os.getenv("LOG_LEVEL", "DEBUG").lower()
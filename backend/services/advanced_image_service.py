@@ -3,12 +3,15 @@
 PyMuPDF, OpenCV, Tesseract를 활용한 향상된 이미지 분석
 """
 import os
+import hashlib
 import tempfile
 import logging
 from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
+from services.pdf_lock import FITZ_LOCK
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -38,6 +41,30 @@ except ImportError as e:
     logger.warning(f"이미지 처리 라이브러리 누락: {e}")
     REQUIRED_LIBS_AVAILABLE = False
 
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# OCR 결과 캐시 위치 (이미지 바이트 SHA-1 기준)
+OCR_CACHE_DIR = "reports/.ocr_cache"
+# diskcache가 없을 때 사용하는 메모리 캐시 최대 항목 수
+OCR_MEMORY_CACHE_SIZE = 256
+
+
+class _BoundedOCRCache(dict):
+    """최대 크기를 넘으면 가장 오래된 항목부터 제거하는 OCR 메모리 캐시"""
+
+    def __init__(self, maxsize: int = OCR_MEMORY_CACHE_SIZE):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        while len(self) > self.maxsize:
+            del self[next(iter(self))]
+
 class ImageQuality(Enum):
     """이미지 품질 등급"""
     EXCELLENT = "excellent"  # 95% 이상
@@ -86,11 +113,16 @@ class ImageAnalysisResult:
 class AdvancedImageService:
     """고급 이미지 처리 서비스"""
     
-    def __init__(self):
+    def __init__(self, use_ocr_cache: bool = False, ocr_cache_dir: str = OCR_CACHE_DIR):
         self.ocr_config_kor_eng = '--oem 3 --psm 6 -l kor+eng'
         self.ocr_config_eng = '--oem 3 --psm 6 -l eng'
         self.ocr_config_table = '--oem 3 --psm 4 -l kor+eng'  # 표 전용
         
+        # OCR 결과 캐시 (기본 비활성화, diskcache 없으면 크기 제한 메모리 캐시)
+        self.ocr_cache = None
+        if use_ocr_cache:
+            self.ocr_cache = diskcache.Cache(ocr_cache_dir) if DISKCACHE_AVAILABLE else _BoundedOCRCache()
+        
     def extract_images_with_metadata(self, pdf_path: str) -> List[ImageMetadata]:
         """PDF에서 향상된 메타데이터와 함께 이미지 추출"""
         if not REQUIRED_LIBS_AVAILABLE:
@@ -100,27 +132,28 @@ class AdvancedImageService:
         images = []
         
         try:
-            pdf_document = fitz.open(pdf_path)
+            with FITZ_LOCK:
+                pdf_document = fitz.open(pdf_path)
             
-            for page_num in range(pdf_document.page_count):
-                page = pdf_document[page_num]
-                image_list = page.get_images(full=True)
+                for page_num in range(pdf_document.page_count):
+                    page = pdf_document[page_num]
+                    image_list = page.get_images(full=True)
                 
-                for img_index, img in enumerate(image_list):
-                    try:
-                        metadata = self._extract_image_metadata(
-                            pdf_document, page, img, page_num, img_index
-                        )
+                    for img_index, img in enumerate(image_list):
+                        try:
+                            metadata = self._extract_image_metadata(
+                                pdf_document, page, img, page_num, img_index
+                            )
                         
-                        # 최소 크기 조건 확인 (아이콘 등 제외)
-                        if (metadata.width >= 50 and metadata.height >= 50 
-                            and metadata.size_bytes >= 2000):
-                            images.append(metadata)
+                            # 최소 크기 조건 확인 (아이콘 등 제외)
+                            if (metadata.width >= 50 and metadata.height >= 50 
+                                and metadata.size_bytes >= 2000):
+                                images.append(metadata)
                             
-                    except Exception as e:
-                        logger.warning(f"페이지 {page_num + 1}, 이미지 {img_index} 메타데이터 추출 실패: {e}")
+                        except Exception as e:
+                            logger.warning(f"페이지 {page_num + 1}, 이미지 {img_index} 메타데이터 추출 실패: {e}")
             
-            pdf_document.close()
+                pdf_document.close()
             
         except Exception as e:
             logger.error(f"PDF 이미지 추출 실패: {e}")
@@ -169,11 +202,14 @@ class AdvancedImageService:
         except Exception:
             return (0, 0, 0, 0)
     
-    def analyze_image_comprehensive(self, metadata: ImageMetadata, pdf_path: str) -> ImageAnalysisResult:
-        """종합적인 이미지 분석"""
+    def analyze_image_comprehensive(self, metadata: ImageMetadata, pdf_path: str,
+                                    image_bytes: Optional[bytes] = None) -> ImageAnalysisResult:
+        """종합적인 이미지 분석 (image_bytes가 주어지면 PDF를 다시 열지 않음)"""
         try:
             # PDF에서 이미지 데이터 추출
-            image_data = self._get_image_data(pdf_path, metadata.xref)
+            if image_bytes is None:
+                image_bytes = self._get_image_bytes(pdf_path, metadata.xref)
+            image_data = self._decode_image(image_bytes)
             
             # 이미지 품질 평가
             quality = self._assess_image_quality(image_data, metadata)
@@ -184,8 +220,9 @@ class AdvancedImageService:
             # 처리 전략 결정
             strategy = self._determine_processing_strategy(quality, image_type)
             
-            # OCR 수행
-            ocr_result = self._perform_advanced_ocr(image_data, strategy, image_type)
+            # OCR 수행 (동일 이미지는 캐시 재사용)
+            cache_key = f"{hashlib.sha1(image_bytes).hexdigest()}:{strategy}:{image_type.value}"
+            ocr_result = self._perform_advanced_ocr(image_data, strategy, image_type, cache_key)
             
             # 텍스트 영역 분석
             text_regions = self._analyze_text_regions(image_data)
@@ -219,11 +256,37 @@ class AdvancedImageService:
     
     def _get_image_data(self, pdf_path: str, xref: int) -> np.ndarray:
         """PDF에서 이미지 데이터 추출"""
-        pdf_doc = fitz.open(pdf_path)
-        base_image = pdf_doc.extract_image(xref)
-        image_bytes = base_image["image"]
-        pdf_doc.close()
-        
+        return self._decode_image(self._get_image_bytes(pdf_path, xref))
+    
+    def _get_image_bytes(self, pdf_path: str, xref: int) -> bytes:
+        """PDF에서 원본 이미지 바이트 추출"""
+        with FITZ_LOCK:
+            pdf_doc = fitz.open(pdf_path)
+            try:
+                return pdf_doc.extract_image(xref)["image"]
+            finally:
+                pdf_doc.close()
+    
+    def extract_image_bytes(self, pdf_path: str, xrefs: List[int]) -> Dict[int, bytes]:
+        """PDF를 한 번만 열어 여러 이미지의 원본 바이트를 추출 (fitz 호출은 전역 락 안에서만 수행)"""
+        image_bytes: Dict[int, bytes] = {}
+        with FITZ_LOCK:
+            pdf_doc = fitz.open(pdf_path)
+            try:
+                for xref in xrefs:
+                    if xref in image_bytes:
+                        continue
+                    try:
+                        image_bytes[xref] = pdf_doc.extract_image(xref)["image"]
+                    except Exception as e:
+                        logger.warning(f"이미지 바이트 추출 실패 (xref={xref}): {e}")
+                        image_bytes[xref] = b""
+            finally:
+                pdf_doc.close()
+        return image_bytes
+    
+    def _decode_image(self, image_bytes: bytes) -> np.ndarray:
+        """이미지 바이트를 OpenCV 배열로 변환"""
         # PIL Image로 변환 후 OpenCV 배열로
         pil_image = Image.open(io.BytesIO(image_bytes))
         if pil_image.mode != 'RGB':
@@ -310,11 +373,18 @@ class AdvancedImageService:
         else:
             return "general"
     
-    def _perform_advanced_ocr(self, image: np.ndarray, strategy: str, image_type: ImageType) -> Dict[str, Any]:
-        """고급 OCR 수행"""
+    def _perform_advanced_ocr(self, image: np.ndarray, strategy: str, image_type: ImageType,
+                              cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """고급 OCR 수행 (cache_key가 주어지면 성공한 결과만 캐시)"""
         if strategy == "skip":
             return {"text": "", "confidence": 0.0}
         
+        if self.ocr_cache is not None and cache_key is not None:
+            cached = self.ocr_cache.get(cache_key)
+            if cached is not None:
+                text, confidence = cached
+                return {"text": text, "confidence": confidence}
+        
         # OCR 라이브러리 사용 가능 여부 확인
         if not REQUIRED_LIBS_AVAILABLE:
             logger.warning("OCR 라이브러리가 설치되지 않음, 메타데이터만 추출")
@@ -338,6 +408,9 @@ class AdvancedImageService:
             # 텍스트 정제
             cleaned_text = self._clean_ocr_text_advanced(ocr_text)
             
+            if self.ocr_cache is not None and cache_key is not None:
+                self.ocr_cache[cache_key] = (cleaned_text, confidence)
+            
             return {
                 "text": cleaned_text,
                 "confidence": confidence
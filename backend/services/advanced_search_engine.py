@@ -2,9 +2,13 @@
 고급 벡터 유사도 검색 엔진
 하이브리드 검색(벡터+키워드), 동적 임계값 조정, Top-N 최적화
 """
+import array
 import asyncio
+import hashlib
 import logging
+import re
 import time
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
@@ -17,8 +21,64 @@ from services.vector_store import VectorStoreService
 from services.multi_model_embedding import get_multi_model_embedding_agent
 from agents.query_processor import ProcessedQuery, QueryIntent
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+def _weighted_sum_kernel(vector_scores, keyword_scores, vector_weight, keyword_weight):
+    """하이브리드 스코어 커널 (numba 사용 가능 시 JIT 컴파일)"""
+    out = np.empty_like(vector_scores)
+    for i in range(vector_scores.size):
+        out[i] = vector_weight * vector_scores[i] + keyword_weight * keyword_scores[i]
+    return out
+
+def _running_mean_kernel(count, mean, value):
+    """누적 평균 1건 갱신 (Welford 방식)"""
+    count += 1
+    mean += (value - mean) / count
+    return count, mean
+
+if NUMBA_AVAILABLE:
+    _weighted_sum_kernel = njit(cache=True, fastmath=True)(_weighted_sum_kernel)
+    _running_mean_kernel = njit(cache=True)(_running_mean_kernel)
+
+def compute_hybrid_scores(
+    vector_scores: np.ndarray,
+    keyword_scores: np.ndarray,
+    vector_weight: float,
+    keyword_weight: float
+) -> np.ndarray:
+    """가중 하이브리드 스코어 일괄 계산 (vector_weight * 벡터 + keyword_weight * 키워드)"""
+    if NUMBA_AVAILABLE:
+        return _weighted_sum_kernel(vector_scores, keyword_scores, float(vector_weight), float(keyword_weight))
+    return vector_weight * vector_scores + keyword_weight * keyword_scores
+
+@lru_cache(maxsize=256)
+def _compile_terms_pattern(terms: Tuple[str, ...]) -> "re.Pattern[str]":
+    """용어 목록을 단일 정규식으로 컴파일 (긴 용어 우선, 겹치는 매칭도 찾도록 전방탐색 사용)"""
+    alternation = "|".join(re.escape(term) for term in sorted(set(terms), key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))")
+
+def match_terms(terms: List[str], text: str) -> List[str]:
+    """text에 포함된 용어를 입력 순서대로 반환 (한 번의 스캔)"""
+    terms = [term for term in terms if term]
+    if not terms:
+        return []
+    
+    found = set(_compile_terms_pattern(tuple(terms)).findall(text))
+    # 같은 위치에서 더 긴 용어가 매칭되면 그 접두 용어도 포함된 것으로 처리
+    return [term for term in terms if term in found or any(term in matched for matched in found)]
+
 class SearchStrategy(Enum):
     """검색 전략"""
     VECTOR_ONLY = "vector_only"
@@ -38,7 +98,7 @@ class SearchConfig:
     max_tokens: int = 4000
     adaptive_threshold: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """검색 결과"""
     embedding_id: int
@@ -55,6 +115,7 @@ class SearchResult:
     model: str
     created_at: str
     relevance_reason: str
+    token_count: int = 0  # 추정 토큰 수 (0이면 최초 사용 시 계산 후 보관)
 
 class AdvancedSearchEngine(VectorStoreService):
     """고급 벡터 검색 엔진"""
@@ -67,10 +128,13 @@ class AdvancedSearchEngine(VectorStoreService):
             "search_count": 0,
             "avg_response_time": 0.0,
             "cache_hits": 0,
-            "search_quality_scores": []
+            "search_quality_scores": array.array('f')  # float32 연속 버퍼
         }
         self._query_cache = {}  # 간단한 캐시
         
+        # 통계 커널 워밍업 (numba JIT 컴파일을 첫 검색 전에 수행)
+        _running_mean_kernel(0, 0.0, 0.0)
+        
     async def _get_embedding_agent(self):
         """임베딩 에이전트 지연 로딩"""
         if self.embedding_agent is None:
@@ -131,7 +195,10 @@ class AdvancedSearchEngine(VectorStoreService):
             return []
     
     async def _generate_query_embedding(self, processed_query: ProcessedQuery) -> List[float]:
-        """질의 임베딩 생성"""
+        """질의 임베딩 생성 (L2 정규화 후 ProcessedQuery에 보관하여 전략 간 재사용)"""
+        if processed_query.embedding:
+            return processed_query.embedding
+        
         try:
             embedding_agent = await self._get_embedding_agent()
             
@@ -141,7 +208,16 @@ class AdvancedSearchEngine(VectorStoreService):
                 search_text += " " + " ".join(processed_query.insurance_terms)
             
             embeddings = await embedding_agent.generate_embeddings([search_text])
-            return embeddings[0] if embeddings else []
+            if not embeddings:
+                return []
+            
+            # 단위 벡터로 정규화하면 코사인 유사도가 내적과 같아짐
+            vector = np.asarray(embeddings[0], dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+            processed_query.embedding = vector.tolist()
+            return processed_query.embedding
             
         except Exception as e:
             logger.error(f"질의 임베딩 생성 실패: {e}")
@@ -419,18 +495,18 @@ class AdvancedSearchEngine(VectorStoreService):
                     # 새 결과 추가
                     combined_map[result.embedding_id] = result
             
-            # 하이브리드 스코어 계산
-            combined_results = []
-            for result in combined_map.values():
-                # 정규화된 하이브리드 스코어
-                hybrid_score = (
-                    config.vector_weight * result.vector_score +
-                    config.keyword_weight * result.keyword_score
-                )
-                
+            # 하이브리드 스코어 계산 (일괄 벡터 연산)
+            combined_results = list(combined_map.values())
+            count = len(combined_results)
+            vector_scores = np.fromiter((r.vector_score for r in combined_results), dtype=np.float64, count=count)
+            keyword_scores = np.fromiter((r.keyword_score for r in combined_results), dtype=np.float64, count=count)
+            hybrid_scores = compute_hybrid_scores(
+                vector_scores, keyword_scores, config.vector_weight, config.keyword_weight
+            )
+            
+            for result, hybrid_score in zip(combined_results, hybrid_scores.tolist()):
                 result.hybrid_score = hybrid_score
                 result.final_score = hybrid_score
-                combined_results.append(result)
             
             # 스코어 순으로 정렬
             combined_results.sort(key=lambda x: x.final_score, reverse=True)
@@ -489,8 +565,10 @@ class AdvancedSearchEngine(VectorStoreService):
         total_tokens = 0
         
         for result in results:
-            # 간단한 토큰 수 추정 (한국어 기준)
-            estimated_tokens = len(result.chunk_text) // 2
+            # 간단한 토큰 수 추정 (한국어 기준) - 결과 객체에 한 번만 계산
+            if not result.token_count:
+                result.token_count = len(result.chunk_text) // 2
+            estimated_tokens = result.token_count
             
             if total_tokens + estimated_tokens <= max_tokens:
                 filtered.append(result)
@@ -511,9 +589,8 @@ class AdvancedSearchEngine(VectorStoreService):
             reasons.append("키워드 직접 매칭")
         
         # 보험 용어 매칭 확인
-        for term in processed_query.insurance_terms:
-            if term in result.chunk_text:
-                reasons.append(f"'{term}' 용어 매칭")
+        for term in match_terms(processed_query.insurance_terms, result.chunk_text):
+            reasons.append(f"'{term}' 용어 매칭")
         
         if not reasons:
             reasons.append("일반적 관련성")
@@ -521,24 +598,32 @@ class AdvancedSearchEngine(VectorStoreService):
         return ", ".join(reasons)
     
     def _generate_cache_key(self, processed_query: ProcessedQuery, strategy: SearchStrategy, config: SearchConfig) -> str:
-        """캐시 키 생성"""
+        """캐시 키 생성 (정규 직렬화 + blake2b)"""
         key_data = {
             "query": processed_query.normalized,
             "intent": processed_query.intent.value,
             "strategy": strategy.value,
             "threshold": config.similarity_threshold,
-            "top_k": config.top_k
+            "top_k": config.top_k,
+            "vector_weight": config.vector_weight,
+            "keyword_weight": config.keyword_weight
         }
-        return str(hash(json.dumps(key_data, sort_keys=True)))
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(key_data, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
     
     def _update_performance_stats(self, response_time: float, result_count: int):
         """성능 통계 업데이트"""
-        self._performance_stats["search_count"] += 1
-        
         # 이동 평균으로 응답 시간 업데이트
-        current_avg = self._performance_stats["avg_response_time"]
-        count = self._performance_stats["search_count"]
-        self._performance_stats["avg_response_time"] = (current_avg * (count - 1) + response_time) / count
+        count, avg = _running_mean_kernel(
+            self._performance_stats["search_count"],
+            self._performance_stats["avg_response_time"],
+            float(response_time)
+        )
+        self._performance_stats["search_count"] = int(count)
+        self._performance_stats["avg_response_time"] = float(avg)
         
         # 검색 품질 점수 (임시)
         quality_score = min(result_count / 10, 1.0)  # 10개 결과를 최대로 가정
@@ -548,10 +633,33 @@ class AdvancedSearchEngine(VectorStoreService):
         if len(self._performance_stats["search_quality_scores"]) > 100:
             self._performance_stats["search_quality_scores"] = self._performance_stats["search_quality_scores"][-100:]
     
+    def _update_performance_stats_bulk(self, response_times: np.ndarray, result_counts: np.ndarray):
+        """성능 통계 일괄 업데이트 (여러 검색 결과를 한 번에 반영)"""
+        response_times = np.asarray(response_times, dtype=np.float64)
+        result_counts = np.asarray(result_counts, dtype=np.float64)
+        if response_times.size == 0:
+            return
+        
+        previous_count = self._performance_stats["search_count"]
+        new_count = previous_count + response_times.size
+        self._performance_stats["search_count"] = new_count
+        
+        # 누적 평균으로 응답 시간 업데이트
+        current_avg = self._performance_stats["avg_response_time"]
+        self._performance_stats["avg_response_time"] = (
+            current_avg * previous_count + float(response_times.sum())
+        ) / new_count
+        
+        # 검색 품질 점수 (임시) - 최근 100개만 유지
+        quality_scores = np.minimum(result_counts / 10, 1.0).tolist()
+        self._performance_stats["search_quality_scores"].extend(quality_scores)
+        if len(self._performance_stats["search_quality_scores"]) > 100:
+            self._performance_stats["search_quality_scores"] = self._performance_stats["search_quality_scores"][-100:]
+    
     async def get_performance_stats(self) -> Dict[str, Any]:
         """성능 통계 조회"""
-        quality_scores = self._performance_stats["search_quality_scores"]
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0.0
+        quality_scores = np.frombuffer(self._performance_stats["search_quality_scores"], dtype=np.float32)
+        avg_quality = float(quality_scores.mean()) if quality_scores.size else 0.0
         
         return {
             "search_count": self._performance_stats["search_count"],
@@ -6,6 +6,7 @@ import re
 import logging
 import time
 from enum import Enum
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 
@@ -26,6 +27,11 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4)
+def _get_encoding(name: str = "cl100k_base"):
+    """tiktoken 인코딩 로드 (BPE 테이블 로드는 프로세스당 한 번)"""
+    return tiktoken.get_encoding(name)
+
 class ChunkingStrategy(Enum):
     """청킹 전략"""
     FIXED_SIZE = "fixed_size"
@@ -46,13 +52,15 @@ class ChunkingConfig:
 class AdvancedChunkingService:
     """고급 청킹 서비스 메인 클래스"""
     
-    def __init__(self, config: Optional[ChunkingConfig] = None):
+    def __init__(self, config: Optional[ChunkingConfig] = None, tokenizer=None):
         self.config = config or ChunkingConfig()
         
-        # 토큰화 초기화
-        if TIKTOKEN_AVAILABLE:
+        # 토큰화 초기화 (외부에서 생성한 인코더가 있으면 재사용)
+        if tokenizer is not None:
+            self.tokenizer = tokenizer
+        elif TIKTOKEN_AVAILABLE:
             try:
-                self.tokenizer = tiktoken.get_encoding("cl100k_base")
+                self.tokenizer = _get_encoding("cl100k_base")
             except Exception as e:
                 logger.warning(f"tiktoken 초기화 실패: {e}")
                 self.tokenizer = None
@@ -115,7 +123,7 @@ class AdvancedChunkingService:
         
         metadata = metadata or {}
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 선택된 전략으로 청킹
         if self.config.strategy == ChunkingStrategy.FIXED_SIZE:
@@ -130,7 +138,7 @@ class AdvancedChunkingService:
         # 청킹 후 검증 및 최적화
         chunks = self._post_process_chunks(chunks)
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         logger.info(
             f"청킹 완료: 전략={self.config.strategy.value}, "
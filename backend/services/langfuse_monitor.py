@@ -5,6 +5,7 @@ Multi-Agent 워크플로우 추적 및 성능 메트릭 수집
 import os
 import logging
 import asyncio
+import httpx
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from contextlib import asynccontextmanager
@@ -33,9 +34,11 @@ logger = logging.getLogger(__name__)
 class LangFuseMonitor:
     """LangFuse 기반 워크플로우 모니터링 서비스"""
     
-    def __init__(self):
+    def __init__(self, httpx_client: Optional[httpx.Client] = None):
         self.langfuse = None
         self.enabled = False
+        # 호출자가 커넥션 풀을 공유하려는 경우에만 지정 (미지정 시 SDK 기본 클라이언트 사용, 수명은 호출자가 관리)
+        self.httpx_client = httpx_client
         
         # 워크플로우 로거 초기화 (로컬 DB 백업용)
         self.workflow_logger = None
@@ -75,11 +78,11 @@ class LangFuseMonitor:
             if host == "http://localhost:3001":
                 logger.info("Self-hosted LangFuse 모드로 연결 시도")
             
-            self.langfuse = Langfuse(
-                secret_key=secret_key,
-                public_key=public_key,
-                host=host
-            )
+            client_kwargs = {"secret_key": secret_key, "public_key": public_key, "host": host}
+            if self.httpx_client is not None:
+                client_kwargs["httpx_client"] = self.httpx_client
+
+            self.langfuse = Langfuse(**client_kwargs)
             
             # 연결 테스트
             self._test_connection()
@@ -88,6 +91,7 @@ class LangFuseMonitor:
             
         except Exception as e:
             logger.error(f"LangFuse 클라이언트 초기화 실패: {e}")
+            self.langfuse = None
             self.enabled = False
     
     def _setup_ssl_certificates(self):
@@ -264,7 +268,37 @@ class LangFuseMonitor:
                 )
             except Exception as e:
                 logger.warning(f"로컬 DB 메트릭 백업 실패: {e}")
-    
+
+    async def log_metrics_batch(self, metrics_list: List[Dict[str, Any]]):
+        """여러 성능 메트릭을 한 번에 로깅 (SDK 큐 적재 후 로컬 DB 백업은 동시 실행)"""
+        if not self.enabled or not metrics_list:
+            return
+
+        for metrics in metrics_list:
+            try:
+                self.langfuse.create_event(
+                    name="performance_metrics",
+                    metadata=metrics
+                )
+            except Exception as e:
+                logger.error(f"메트릭 로깅 실패: {e}")
+        logger.debug(f"성능 메트릭 {len(metrics_list)}건 로깅 완료")
+
+        if self.workflow_logger:
+            backups = [
+                self.workflow_logger.log_workflow_step(
+                    workflow_id=metrics.get("workflow_id", "unknown"),
+                    step_name=metrics.get("step_name", "metrics"),
+                    status=metrics.get("status", "completed"),
+                    input_data={"metrics": metrics},
+                    execution_time=int(metrics.get("execution_time", 0) * 1000) if metrics.get("execution_time") else None
+                )
+                for metrics in metrics_list if metrics.get("workflow_id")
+            ]
+            for result in await asyncio.gather(*backups, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"로컬 DB 메트릭 백업 실패: {result}")
+
     def _sanitize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """민감한 정보 마스킹 및 데이터 크기 제한"""
         if not isinstance(data, dict):
@@ -432,8 +466,16 @@ def get_monitor():
 
 
 # 데코레이터 함수들
+def _identity_decorator(func):
+    """추적 비활성화 시 사용하는 no-op 데코레이터 (래퍼 프레임/메타데이터 생성 없음)"""
+    return func
+
+
 def trace_workflow(workflow_name: str, metadata: Optional[Dict[str, Any]] = None):
-    """워크플로우 추적 데코레이터"""
+    """워크플로우 추적 데코레이터 (LangFuse 비활성화 시 원본 함수를 그대로 반환)"""
+    if not langfuse_monitor.enabled:
+        return _identity_decorator
+
     def decorator(func):
         async def wrapper(*args, **kwargs):
             async with langfuse_monitor.trace_workflow(workflow_name, metadata) as trace:
@@ -444,7 +486,10 @@ def trace_workflow(workflow_name: str, metadata: Optional[Dict[str, Any]] = None
 
 
 def trace_agent(agent_name: str):
-    """에이전트 실행 추적 데코레이터"""
+    """에이전트 실행 추적 데코레이터 (LangFuse 비활성화 시 원본 함수를 그대로 반환)"""
+    if not langfuse_monitor.enabled:
+        return _identity_decorator
+
     def decorator(func):
         async def wrapper(*args, **kwargs):
             import time
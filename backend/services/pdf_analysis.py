@@ -7,6 +7,8 @@ import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 import logging
 
+from services.pdf_lock import FITZ_LOCK
+
 try:
     import fitz  # PyMuPDF
     PYMUPDF_AVAILABLE = True
@@ -37,55 +39,56 @@ class PDFQualityAnalyzer:
             return {"error": "PyMuPDF가 설치되지 않음"}
         
         try:
-            doc = fitz.open(file_path)
+            with FITZ_LOCK:
+                doc = fitz.open(file_path)
             
-            analysis_result = {}
+                analysis_result = {}
             
-            # 각 단계별로 try-catch 적용
-            try:
-                analysis_result["file_info"] = self._get_file_info(file_path, doc)
-            except Exception as e:
-                logger.error(f"파일 정보 분석 실패: {str(e)}")
-                analysis_result["file_info"] = {"error": str(e)}
+                # 각 단계별로 try-catch 적용
+                try:
+                    analysis_result["file_info"] = self._get_file_info(file_path, doc)
+                except Exception as e:
+                    logger.error(f"파일 정보 분석 실패: {str(e)}")
+                    analysis_result["file_info"] = {"error": str(e)}
             
-            try:
-                analysis_result["document_type"] = self._classify_document_type(doc)
-            except Exception as e:
-                logger.error(f"문서 타입 분류 실패: {str(e)}")
-                analysis_result["document_type"] = {"error": str(e)}
+                try:
+                    analysis_result["document_type"] = self._classify_document_type(doc)
+                except Exception as e:
+                    logger.error(f"문서 타입 분류 실패: {str(e)}")
+                    analysis_result["document_type"] = {"error": str(e)}
             
-            try:
-                analysis_result["pages_analysis"] = self._analyze_pages(doc)
-            except Exception as e:
-                logger.error(f"페이지 분석 실패: {str(e)}")
-                analysis_result["pages_analysis"] = []
+                try:
+                    analysis_result["pages_analysis"] = self._analyze_pages(doc)
+                except Exception as e:
+                    logger.error(f"페이지 분석 실패: {str(e)}")
+                    analysis_result["pages_analysis"] = []
             
-            try:
-                analysis_result["table_regions"] = self._detect_table_regions(doc)
-            except Exception as e:
-                logger.error(f"표 영역 탐지 실패: {str(e)}")
-                analysis_result["table_regions"] = []
+                try:
+                    analysis_result["table_regions"] = self._detect_table_regions(doc)
+                except Exception as e:
+                    logger.error(f"표 영역 탐지 실패: {str(e)}")
+                    analysis_result["table_regions"] = []
             
-            try:
-                analysis_result["image_analysis"] = self._analyze_images(doc)
-            except Exception as e:
-                logger.error(f"이미지 분석 실패: {str(e)}")
-                analysis_result["image_analysis"] = {}
+                try:
+                    analysis_result["image_analysis"] = self._analyze_images(doc)
+                except Exception as e:
+                    logger.error(f"이미지 분석 실패: {str(e)}")
+                    analysis_result["image_analysis"] = {}
             
-            try:
-                analysis_result["scan_quality"] = self._evaluate_scan_quality(doc)
-            except Exception as e:
-                logger.error(f"스캔 품질 평가 실패: {str(e)}")
-                analysis_result["scan_quality"] = {}
+                try:
+                    analysis_result["scan_quality"] = self._evaluate_scan_quality(doc)
+                except Exception as e:
+                    logger.error(f"스캔 품질 평가 실패: {str(e)}")
+                    analysis_result["scan_quality"] = {}
             
-            # 처리 전략 결정
-            try:
-                analysis_result["processing_strategy"] = self._determine_processing_strategy(analysis_result)
-            except Exception as e:
-                logger.error(f"처리 전략 결정 실패: {str(e)}")
-                analysis_result["processing_strategy"] = {}
+                # 처리 전략 결정
+                try:
+                    analysis_result["processing_strategy"] = self._determine_processing_strategy(analysis_result)
+                except Exception as e:
+                    logger.error(f"처리 전략 결정 실패: {str(e)}")
+                    analysis_result["processing_strategy"] = {}
             
-            doc.close()
+                doc.close()
             return analysis_result
             
         except Exception as e:
@@ -0,0 +1,9 @@
+"""
+PyMuPDF(fitz) 호출 직렬화
+PyMuPDF는 멀티스레드 사용을 지원하지 않으므로 문서 열기부터 닫기까지의 모든 fitz 호출을
+프로세스 전역 락 안에서 수행합니다. 디코딩/OpenCV/OCR 등 fitz 이후 작업은 락 밖에서 병렬 실행합니다.
+"""
+import threading
+
+# 재진입 가능 락 (fitz 작업 중 다른 fitz 헬퍼를 호출해도 교착되지 않음)
+FITZ_LOCK = threading.RLock()
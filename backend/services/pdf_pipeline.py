@@ -378,38 +378,39 @@ class BatchProcessor:
     
     async def process_multiple_files(self, 
                                    file_paths: List[str], 
-                                   max_concurrent: int = 3) -> List[PipelineResult]:
-        """다중 파일 배치 처리"""
+                                   max_concurrent: int = 3,
+                                   on_result: Optional[Callable[[PipelineResult], None]] = None,
+                                   keep_results: bool = True) -> List[PipelineResult]:
+        """다중 파일 배치 처리 (on_result: 파일별 처리가 끝나는 즉시 호출되는 콜백,
+        keep_results=False면 결과를 보관하지 않고 빈 리스트 반환 - 콜백으로 스트리밍할 때 메모리 절약)"""
         logger.info(f"배치 처리 시작: {len(file_paths)}개 파일")
         
         semaphore = asyncio.Semaphore(max_concurrent)
         
-        async def process_single_file(file_path: str) -> PipelineResult:
+        async def process_single_file(file_path: str) -> Optional[PipelineResult]:
             async with semaphore:
-                pipeline = PDFProcessingPipeline(self.pipeline_config)
-                return await pipeline.process_document(file_path)
+                try:
+                    pipeline = PDFProcessingPipeline(self.pipeline_config)
+                    result = await pipeline.process_document(file_path)
+                except Exception as e:
+                    result = PipelineResult(
+                        success=False,
+                        file_path=file_path,
+                        processing_time=0,
+                        stages_completed=[],
+                        final_state={},
+                        performance_metrics={},
+                        error_message=str(e)
+                    )
+                if on_result:
+                    on_result(result)
+                return result if keep_results else None
         
         tasks = [process_single_file(fp) for fp in file_paths]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 결과 정리
-        self.results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                error_result = PipelineResult(
-                    success=False,
-                    file_path=file_paths[i],
-                    processing_time=0,
-                    stages_completed=[],
-                    final_state={},
-                    performance_metrics={},
-                    error_message=str(result)
-                )
-                self.results.append(error_result)
-            else:
-                self.results.append(result)
+        results = await asyncio.gather(*tasks)
+        self.results = list(results) if keep_results else []
         
-        logger.info(f"배치 처리 완료: {len(self.results)}개 결과")
+        logger.info(f"배치 처리 완료: {len(file_paths)}개 파일")
         return self.results
     
     def get_batch_summary(self) -> Dict[str, Any]:
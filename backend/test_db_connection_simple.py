@@ -1,14 +1,21 @@
 """
 간단한 데이터베이스 연결 테스트
 실제 DB 연계를 위한 기본 상태 확인
+
+--create-tables: 기본 테스트 통과 후 테이블 확인/생성까지 수행 (기존 test_db_simple.py)
 """
+import argparse
 import asyncio
 import logging
+import sys
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 추정 레코드 수가 이보다 작을 때만 COUNT(*)로 정확히 센다
+EXACT_COUNT_THRESHOLD = 1000
+
 async def test_basic_connection():
     """기본 연결 테스트"""
     print("=" * 50)
@@ -49,23 +56,25 @@ async def test_basic_queries():
         from sqlalchemy import text
         
         async with get_async_session() as db:
+            # 기본 SELECT / 현재 시간 / 버전 정보를 한 번의 왕복으로 조회
+            result = await db.execute(text(
+                "SELECT 1 AS test_value, NOW() AS current_time, version() AS pg_version"
+            ))
+            test_value, current_time, pg_version = result.one()
+            
             # 1. 간단한 SELECT 테스트
             print("1. 기본 SELECT 테스트...")
-            result = await db.execute(text("SELECT 1 as test_value"))
-            row = result.fetchone()
-            print(f"   결과: {row.test_value if row else 'None'}")
+            print(f"   결과: {test_value}")
             
             # 2. 현재 시간 조회
             print("2. 현재 시간 조회...")
-            result = await db.execute(text("SELECT NOW() as current_time"))
-            row = result.fetchone()
-            print(f"   결과: {row.current_time if row else 'None'}")
+            print(f"   결과: {current_time}")
             
             # 3. 버전 정보 조회
             print("3. PostgreSQL 버전 확인...")
-            result = await db.execute(text("SELECT version()"))
-            row = result.fetchone()
-            version = str(row[0])[:50] + "..." if row and len(str(row[0])) > 50 else str(row[0]) if row else "Unknown"
+            version = str(pg_version)
+            if len(version) > 50:
+                version = version[:50] + "..."
             print(f"   결과: {version}")
             
             return True
@@ -84,44 +93,79 @@ async def test_table_exists():
         from services.database import get_async_session
         from sqlalchemy import text
         
+        # 임베딩 테이블 확인
+        tables_to_check = [
+            "policies",
+            "embeddings_text_embedding_3", 
+            "embeddings_qwen"
+        ]
+        
         async with get_async_session() as db:
-            # 임베딩 테이블 확인
-            tables_to_check = [
-                "policies",
-                "embeddings_text_embedding_3", 
-                "embeddings_qwen"
-            ]
-            
-            for table_name in tables_to_check:
-                print(f"테이블 '{table_name}' 확인...")
-                
-                # 테이블 존재 확인
-                check_query = """
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_schema = 'public' 
-                        AND table_name = :table_name
-                    )
-                """
-                result = await db.execute(text(check_query), {"table_name": table_name})
-                exists = result.scalar()
-                
-                if exists:
-                    # 레코드 수 확인
-                    count_query = f"SELECT COUNT(*) FROM {table_name}"
-                    result = await db.execute(text(count_query))
-                    count = result.scalar()
-                    print(f"   ✅ 존재함 (레코드 수: {count})")
-                else:
-                    print(f"   ❌ 존재하지 않음")
+            # 모든 테이블의 존재 여부와 추정 레코드 수를 한 번의 쿼리로 조회
+            # (to_regclass 카탈로그 조회 + ANALYZE로 갱신되는 pg_class.reltuples)
+            result = await db.execute(
+                text("""
+                    SELECT t.name, c.reltuples::bigint AS estimate
+                    FROM unnest(CAST(:names AS text[])) AS t(name)
+                    JOIN pg_class c ON c.oid = to_regclass('public.' || t.name)
+                """),
+                {"names": tables_to_check}
+            )
+            estimates = {name: estimate for name, estimate in result.all()}
+        
+        async def count_rows(table_name: str):
+            """테이블별 레코드 수 확인 (태스크마다 별도 세션)"""
+            async with get_async_session() as db:
+                result = await db.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
+                return result.scalar_one()
+        
+        # 추정치가 작은 테이블만 정확한 레코드 수를 동시에 조회 (대형 테이블 전체 스캔 방지)
+        counted_tables = [
+            name for name in tables_to_check
+            if name in estimates and estimates[name] < EXACT_COUNT_THRESHOLD
+        ]
+        counts = dict(zip(
+            counted_tables,
+            await asyncio.gather(*[count_rows(name) for name in counted_tables])
+        ))
+        
+        for table_name in tables_to_check:
+            print(f"테이블 '{table_name}' 확인...")
             
-            return True
+            if table_name in counts:
+                print(f"   ✅ 존재함 (레코드 수: {counts[table_name]})")
+            elif table_name in estimates:
+                print(f"   ✅ 존재함 (레코드 수: ~{estimates[table_name]} (추정))")
+            else:
+                print(f"   ❌ 존재하지 않음")
+        
+        return True
             
     except Exception as e:
         print(f"❌ 테이블 확인 실패: {e}")
         return False
 
-async def main():
+async def test_create_tables_if_requested(create_tables: bool = False):
+    """테이블 확인/생성 (--create-tables 지정 시에만 실행)"""
+    if not create_tables:
+        return True
+    
+    print("\n" + "=" * 50)
+    print("테이블 확인/생성")
+    print("=" * 50)
+    
+    try:
+        from services.database import create_tables as create_db_tables
+        
+        await create_db_tables()
+        print("✅ DB 연결 및 테이블 확인/생성 성공!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 테이블 확인/생성 실패: {e}")
+        return False
+
+async def main(create_tables: bool = False):
     """메인 테스트 실행"""
     print("실제 데이터베이스 연계 테스트 시작")
     print("=" * 60)
@@ -137,6 +181,10 @@ async def main():
             # 3. 테이블 존재 확인
             table_ok = await test_table_exists()
             
+            # 4. 테이블 확인/생성 (선택)
+            if table_ok:
+                table_ok = await test_create_tables_if_requested(create_tables)
+            
             if table_ok:
                 print("\n" + "=" * 60)
                 print("✅ 모든 기본 테스트 통과 - 실제 기능 테스트 준비 완료")
@@ -149,5 +197,16 @@ async def main():
     return False
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop이 있으면 이벤트 루프 오버헤드 감소 (uvicorn[standard]에 포함)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    parser = argparse.ArgumentParser(description="데이터베이스 연결 테스트")
+    parser.add_argument("--create-tables", action="store_true", help="테이블 확인/생성까지 수행")
+    args = parser.parse_args()
+    
+    success = asyncio.run(main(create_tables=args.create_tables))
+    sys.exit(0 if success else 1)
 
@@ -7,7 +7,10 @@ import os
 import sys
 import time
 import json
+import logging
+from collections import Counter
 from pathlib import Path
+from typing import List
 from datetime import datetime
 
 # 현재 디렉토리를 Python 경로에 추가
@@ -16,13 +19,40 @@ sys.path.insert(0, os.path.dirname(__file__))
 from agents.image_processor import ImageProcessorAgent
 from agents.base import DocumentProcessingState
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_default(obj):
+    """JSON 기본 직렬화 불가 객체 변환 (Enum → value, 객체 → __dict__, 그 외 → str)"""
+    if hasattr(obj, 'value'):  # Enum 객체
+        return obj.value
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    if hasattr(obj, 'item'):  # numpy 스칼라 (json 대체 경로)
+        return obj.item()
+    return str(obj)
+
 class ImageProcessingTestReport:
     """이미지 처리 테스트 결과 보고서"""
     
     def __init__(self, test_pdf_path: str):
         self.test_pdf_path = test_pdf_path
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.console_output = []
+        self.reports_dir = Path("reports/image_processing")
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.base_filename = f"image_processing_report_{self.timestamp}"
+        
+        # 콘솔 로그는 메모리에 쌓지 않고 파일로 바로 기록
+        self.console_log_file = self.reports_dir / f"{self.base_filename}_console.log"
+        self._console_handler = logging.FileHandler(self.console_log_file, mode='w', encoding='utf-8', delay=True)
+        self._console_handler.setFormatter(logging.Formatter("%(message)s"))
+        self._console_logger = logging.getLogger(f"report.image_processing.{id(self)}")
+        self._console_logger.setLevel(logging.INFO)
+        self._console_logger.propagate = False
+        self._console_logger.addHandler(self._console_handler)
         self.test_results = {
             "metadata": {
                 "test_file": test_pdf_path,
@@ -36,90 +66,95 @@ class ImageProcessingTestReport:
         }
     
     def log_console(self, message: str):
-        """콘솔 출력을 로그에 저장"""
-        self.console_output.append(message)
+        """콘솔 출력을 로그 파일에 기록"""
+        self._console_logger.info(message)
         print(message)
     
+    def close(self):
+        """콘솔 로그 핸들러를 닫고 로거에서 제거 (보고서 인스턴스마다 파일 디스크립터가 남지 않도록)"""
+        self._console_logger.removeHandler(self._console_handler)
+        self._console_handler.close()
+    
     def save_reports(self):
         """보고서들을 파일로 저장"""
-        reports_dir = Path("reports/image_processing")
-        reports_dir.mkdir(parents=True, exist_ok=True)
+        reports_dir = self.reports_dir
+        base_filename = self.base_filename
         
-        base_filename = f"image_processing_report_{self.timestamp}"
-        
-        # JSON 상세 보고서
+        # JSON 상세 보고서 (numpy 스칼라/NaN은 인코더가 처리, 객체만 default로 변환)
         json_file = reports_dir / f"{base_filename}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            # JSON 직렬화 가능한 데이터로 변환
-            def json_serializable(obj):
-                if hasattr(obj, '__dict__'):
-                    return obj.__dict__
-                elif str(type(obj)) in ['<class \'numpy.float64\'>', '<class \'numpy.int64\'>']:
-                    return float(obj) if 'float' in str(type(obj)) else int(obj)
-                elif obj is None or (hasattr(obj, '__ne__') and obj != obj):
-                    return None
-                else:
-                    try:
-                        json.dumps(obj)
-                        return obj
-                    except (TypeError, ValueError):
-                        return str(obj)
-            
-            serializable_data = json_serializable(self.test_results)
-            json.dump(serializable_data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            json_file.write_bytes(orjson.dumps(
+                self.test_results,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            json_file.write_text(
+                json.dumps(self.test_results, indent=2, ensure_ascii=False, default=_json_default),
+                encoding='utf-8'
+            )
+        
+        # 기계 소비자(CI 등)는 JSON만 사용하므로 텍스트 요약 생략 가능
+        if os.getenv("SKIP_TXT_SUMMARY"):
+            self._console_handler.flush()
+            return {
+                "json_report": str(json_file),
+                "console_log": str(self.console_log_file)
+            }
         
         # 텍스트 요약 보고서
         txt_file = reports_dir / f"{base_filename}_summary.txt"
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("Task 3.4: 이미지 처리 및 OCR 통합 테스트 보고서\n")
-            f.write("=" * 80 + "\n\n")
-            
-            f.write(f"📄 테스트 파일: {self.test_pdf_path}\n")
-            f.write(f"🕐 테스트 시간: {self.timestamp}\n\n")
-            
-            # PDF 정보
-            pdf_info = self.test_results.get("pdf_info", {})
-            f.write(f"📊 PDF 정보:\n")
-            f.write(f"   - 파일 존재: {'예' if pdf_info.get('file_exists') else '아니오'}\n")
-            f.write(f"   - 파일 크기: {pdf_info.get('file_size', 'N/A')}\n\n")
-            
-            # 처리 결과
-            processing = self.test_results.get("processing_results", {})
-            f.write(f"🖼️ 이미지 처리 결과:\n")
-            f.write(f"   - 처리 상태: {processing.get('status', 'N/A')}\n")
-            f.write(f"   - 총 이미지 수: {processing.get('total_images', 0)}개\n")
-            f.write(f"   - OCR 성공: {processing.get('successful_ocr', 0)}개\n")
-            f.write(f"   - 고품질 이미지: {processing.get('high_quality_images', 0)}개\n")
-            f.write(f"   - 처리 시간: {processing.get('processing_time', 0):.2f}초\n\n")
-            
-            # 품질 분석
-            quality = self.test_results.get("quality_analysis", {})
-            f.write(f"📈 품질 분석:\n")
-            for quality_level, count in quality.items():
-                f.write(f"   - {quality_level}: {count}개\n")
-            f.write("\n")
-            
-            # 검증 결과
-            verification = self.test_results.get("verification_results", {})
-            f.write(f"✓ 검증 결과:\n")
-            for criterion, result in verification.items():
-                status = "✅ 통과" if result.get("passed", False) else "❌ 실패"
-                f.write(f"   - {criterion}: {status} ({result.get('score', 0):.1f}%)\n")
+        parts: List[str] = []
+        parts.append("=" * 80 + "\n")
+        parts.append("Task 3.4: 이미지 처리 및 OCR 통합 테스트 보고서\n")
+        parts.append("=" * 80 + "\n\n")
         
-        # 콘솔 로그
-        log_file = reports_dir / f"{base_filename}_console.log"
-        with open(log_file, 'w', encoding='utf-8') as f:
-            f.write("\n".join(self.console_output))
+        parts.append(f"📄 테스트 파일: {self.test_pdf_path}\n")
+        parts.append(f"🕐 테스트 시간: {self.timestamp}\n\n")
+        
+        # PDF 정보
+        pdf_info = self.test_results.get("pdf_info", {})
+        parts.append(f"📊 PDF 정보:\n")
+        parts.append(f"   - 파일 존재: {'예' if pdf_info.get('file_exists') else '아니오'}\n")
+        parts.append(f"   - 파일 크기: {pdf_info.get('file_size', 'N/A')}\n\n")
+        
+        # 처리 결과
+        processing = self.test_results.get("processing_results", {})
+        parts.append(f"🖼️ 이미지 처리 결과:\n")
+        parts.append(f"   - 처리 상태: {processing.get('status', 'N/A')}\n")
+        parts.append(f"   - 총 이미지 수: {processing.get('total_images', 0)}개\n")
+        parts.append(f"   - OCR 성공: {processing.get('successful_ocr', 0)}개\n")
+        parts.append(f"   - 고품질 이미지: {processing.get('high_quality_images', 0)}개\n")
+        parts.append(f"   - 처리 시간: {processing.get('processing_time', 0):.2f}초\n\n")
+        
+        # 품질 분석
+        quality = self.test_results.get("quality_analysis", {})
+        parts.append(f"📈 품질 분석:\n")
+        for quality_level, count in quality.items():
+            parts.append(f"   - {quality_level}: {count}개\n")
+        parts.append("\n")
+        
+        # 검증 결과
+        verification = self.test_results.get("verification_results", {})
+        parts.append(f"✓ 검증 결과:\n")
+        for criterion, result in verification.items():
+            status = "✅ 통과" if result.get("passed", False) else "❌ 실패"
+            parts.append(f"   - {criterion}: {status} ({result.get('score', 0):.1f}%)\n")
+        
+        with open(txt_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(parts)
+        
+        # 콘솔 로그 (이후 메시지도 계속 같은 파일에 기록됨)
+        self._console_handler.flush()
         
         return {
             "json_report": str(json_file),
             "summary_report": str(txt_file),
-            "console_log": str(log_file)
+            "console_log": str(self.console_log_file)
         }
 
-async def test_image_processing():
-    """이미지 처리 기능 테스트"""
+async def test_image_processing(use_ocr_cache: bool = True):
+    """이미지 처리 기능 테스트 (use_ocr_cache=False면 OCR 캐시 없이 매번 재수행)"""
     test_pdf_path = "uploads/pdf/test_policy.pdf"
     
     # 보고서 초기화
@@ -130,11 +165,11 @@ async def test_image_processing():
         report.log_console("=" * 60)
         
         # PDF 파일 존재 확인
-        if not os.path.exists(test_pdf_path):
+        try:
+            file_size = os.stat(test_pdf_path).st_size
+        except FileNotFoundError:
             report.log_console(f"❌ 테스트 PDF 파일이 없습니다: {test_pdf_path}")
             return
-        
-        file_size = os.path.getsize(test_pdf_path)
         report.test_results["pdf_info"] = {
             "file_exists": True,
             "file_size": f"{file_size:,} bytes ({file_size/1024/1024:.1f} MB)"
@@ -145,7 +180,7 @@ async def test_image_processing():
         
         # ImageProcessorAgent 초기화
         report.log_console("\n🤖 ImageProcessorAgent 초기화...")
-        agent = ImageProcessorAgent()
+        agent = ImageProcessorAgent(use_ocr_cache=use_ocr_cache)
         
         # 테스트용 State 생성
         state: DocumentProcessingState = {
@@ -161,11 +196,11 @@ async def test_image_processing():
         
         # 이미지 처리 실행
         report.log_console("\n🔄 이미지 처리 및 OCR 실행...")
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         result_state = await agent.process(state)
         
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         # 결과 분석
         report.log_console(f"\n✅ 처리 완료 (소요시간: {processing_time:.2f}초)")
@@ -175,6 +210,9 @@ async def test_image_processing():
         image_stats = result_state.get("image_processing_stats", {})
         extracted_images = result_state.get("extracted_images", [])
         processed_chunks = result_state.get("processed_chunks", [])
+        image_chunk_count = sum(
+            1 for c in processed_chunks if (c.get("metadata") or {}).get("chunk_type") == "image"
+        )
         
         report.test_results["processing_results"] = {
             "status": status,
@@ -184,7 +222,7 @@ async def test_image_processing():
             "high_quality_images": image_stats.get("high_quality_images", 0),
             "text_regions_found": image_stats.get("text_regions_found", 0),
             "ocr_success_rate": image_stats.get("ocr_success_rate", 0),
-            "chunks_generated": len([c for c in processed_chunks if c.get("metadata", {}).get("chunk_type") == "image"])
+            "chunks_generated": image_chunk_count
         }
         
         report.log_console(f"\n📊 처리 통계:")
@@ -194,19 +232,22 @@ async def test_image_processing():
         report.log_console(f"   - 고품질 이미지: {image_stats.get('high_quality_images', 0)}개")
         report.log_console(f"   - 텍스트 영역: {image_stats.get('text_regions_found', 0)}개")
         report.log_console(f"   - OCR 성공률: {image_stats.get('ocr_success_rate', 0):.1%}")
-        report.log_console(f"   - 생성된 청크: {len([c for c in processed_chunks if c.get('metadata', {}).get('chunk_type') == 'image'])}개")
+        report.log_console(f"   - 생성된 청크: {image_chunk_count}개")
         
         # 품질 분석
         if extracted_images:
-            quality_analysis = {}
-            image_type_analysis = {}
+            # 품질/타입 집계와 샘플 수집을 한 번의 순회로 처리
+            quality_counter = Counter()
+            image_type_counter = Counter()
+            sample_images = []
+            for i, img_analysis in enumerate(extracted_images):
+                quality_counter[img_analysis.quality.value] += 1
+                image_type_counter[img_analysis.image_type.value] += 1
+                if i < 3:
+                    sample_images.append(img_analysis)
             
-            for img_analysis in extracted_images:
-                quality = img_analysis.quality.value
-                img_type = img_analysis.image_type.value
-                
-                quality_analysis[quality] = quality_analysis.get(quality, 0) + 1
-                image_type_analysis[img_type] = image_type_analysis.get(img_type, 0) + 1
+            quality_analysis = dict(quality_counter)
+            image_type_analysis = dict(image_type_counter)
             
             report.test_results["quality_analysis"] = quality_analysis
             report.test_results["image_type_analysis"] = image_type_analysis
@@ -231,7 +272,7 @@ async def test_image_processing():
         # 샘플 이미지 정보 출력
         if extracted_images:
             report.log_console(f"\n📷 샘플 이미지 정보 (최대 3개):")
-            for i, img_analysis in enumerate(extracted_images[:3]):
+            for i, img_analysis in enumerate(sample_images):
                 report.log_console(f"   이미지 {i+1}:")
                 report.log_console(f"     - 페이지: {img_analysis.metadata.page_number}")
                 report.log_console(f"     - 크기: {img_analysis.metadata.width}x{img_analysis.metadata.height}")
@@ -261,14 +302,25 @@ async def test_image_processing():
             print(f"📄 오류 보고서 저장: {saved_files['json_report']}")
         except Exception as save_error:
             print(f"⚠️ 보고서 저장 실패: {save_error}")
+    finally:
+        report.close()
 
 def verify_task_3_4_criteria(stats: dict, images: list, chunks: list) -> dict:
     """Task 3.4 검증 기준 확인"""
     results = {}
     
+    # 메타데이터/맥락 힌트 보유 이미지 수를 한 번의 순회로 집계
+    successful_extractions = len(images)
+    images_with_metadata = 0
+    images_with_context = 0
+    for img in images:
+        if getattr(img, 'metadata', None):
+            images_with_metadata += 1
+        if getattr(img, 'context_hints', None):
+            images_with_context += 1
+    
     # 1. 이미지 추출 완성도 95% 이상
     total_images = stats.get("total_images", 0)
-    successful_extractions = len(images)
     extraction_rate = (successful_extractions / total_images * 100) if total_images > 0 else 0
     
     results["이미지 추출 완성도"] = {
@@ -298,30 +350,28 @@ def verify_task_3_4_criteria(stats: dict, images: list, chunks: list) -> dict:
     }
     
     # 3. 메타데이터 보존 정확도 95% 이상
-    images_with_metadata = len([img for img in images if hasattr(img, 'metadata') and img.metadata])
-    metadata_rate = (images_with_metadata / len(images) * 100) if images else 0
+    metadata_rate = (images_with_metadata / successful_extractions * 100) if images else 0
     
     results["메타데이터 보존 정확도"] = {
         "score": metadata_rate,
         "passed": metadata_rate >= 95.0,
-        "detail": f"{images_with_metadata}/{len(images)} 메타데이터 보존"
+        "detail": f"{images_with_metadata}/{successful_extractions} 메타데이터 보존"
     }
     
     # 4. 이미지-텍스트 연결 식별 75% 이상
-    images_with_context = len([img for img in images if hasattr(img, 'context_hints') and img.context_hints])
-    context_rate = (images_with_context / len(images) * 100) if images else 0
+    context_rate = (images_with_context / successful_extractions * 100) if images else 0
     
     results["이미지-텍스트 연결 식별"] = {
         "score": context_rate,
         "passed": context_rate >= 75.0,
-        "detail": f"{images_with_context}/{len(images)} 맥락 힌트 생성"
+        "detail": f"{images_with_context}/{successful_extractions} 맥락 힌트 생성"
     }
     
     return results
 
 async def main():
-    """메인 테스트 함수"""
-    await test_image_processing()
+    """메인 테스트 함수 (--no-cache: OCR 결과 캐시 비활성화)"""
+    await test_image_processing(use_ocr_cache="--no-cache" not in sys.argv)
     
     print("\n" + "=" * 60)
     print("Task 3.4: 이미지 처리 및 OCR 통합 테스트 완료")
@@ -3,20 +3,31 @@ Task 3.6 통합 PDF 처리 파이프라인 테스트
 전체 파이프라인의 통합 성능 및 안정성 검증
 """
 import asyncio
+import math
 import os
+import sys
 import json
 import logging
 import time
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional
 
+import numpy as np
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from services.pdf_pipeline import (
     PDFProcessingPipeline, 
     PipelineConfig, 
     PipelineMode, 
+    PipelineResult,
     BatchProcessor
 )
 from agents.supervisor import SupervisorAgent
@@ -29,6 +40,14 @@ logger = logging.getLogger(__name__)
 # .env 파일 로드
 load_dotenv()
 
+def _json_default(obj):
+    """JSON 기본 직렬화 불가 객체 변환 (Enum → value, 객체 → __dict__, 그 외 → str)"""
+    if hasattr(obj, 'value'):  # Enum 객체
+        return obj.value
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    return str(obj)
+
 class IntegratedPipelineReport:
     """통합 파이프라인 테스트 보고서"""
 
@@ -45,13 +64,29 @@ class IntegratedPipelineReport:
             "error_analysis": {},
             "recommendations": []
         }
-        self.console_output = []
+        self.reports_dir = Path("reports/integrated_pipeline")
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.base_filename = f"integrated_pipeline_report_{self.timestamp}"
+
+        # 콘솔 로그는 메모리에 쌓지 않고 파일로 바로 기록
+        self.console_log_file = self.reports_dir / f"{self.base_filename}_console.log"
+        self._console_handler = logging.FileHandler(self.console_log_file, mode='w', encoding='utf-8', delay=True)
+        self._console_handler.setFormatter(logging.Formatter("%(message)s"))
+        self._console_logger = logging.getLogger(f"report.integrated_pipeline.{id(self)}")
+        self._console_logger.setLevel(logging.INFO)
+        self._console_logger.propagate = False
+        self._console_logger.addHandler(self._console_handler)
 
     def log_console(self, message: str):
-        """콘솔 출력을 로그에 저장"""
-        self.console_output.append(message)
+        """콘솔 출력을 로그 파일에 기록"""
+        self._console_logger.info(message)
         print(message)
 
+    def close(self):
+        """콘솔 로그 핸들러를 닫고 로거에서 제거 (보고서 인스턴스마다 파일 디스크립터가 남지 않도록)"""
+        self._console_logger.removeHandler(self._console_handler)
+        self._console_handler.close()
+
     def set_system_info(self, system_status: Dict[str, Any]):
         """시스템 정보 설정"""
         self.report_data["system_info"] = system_status
@@ -74,111 +109,132 @@ class IntegratedPipelineReport:
 
     def save_reports(self):
         """보고서들을 파일로 저장"""
-        reports_dir = Path("reports/integrated_pipeline")
-        reports_dir.mkdir(parents=True, exist_ok=True)
+        reports_dir = self.reports_dir
+        base_filename = self.base_filename
 
-        base_filename = f"integrated_pipeline_report_{self.timestamp}"
-
-        # 1. JSON 상세 보고서 저장
+        # 1. JSON 상세 보고서 저장 (Enum/객체만 default로 변환, 나머지는 C 인코더가 처리)
         json_file = reports_dir / f"{base_filename}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            def json_serializable(obj):
-                if hasattr(obj, 'value'):  # Enum 객체
-                    return obj.value
-                if isinstance(obj, dict):
-                    return {k: json_serializable(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [json_serializable(item) for item in obj]
-                elif hasattr(obj, '__dict__'):
-                    return json_serializable(obj.__dict__)
-                elif obj is None or (hasattr(obj, '__ne__') and obj != obj):  # NaN 체크
-                    return None
-                else:
-                    try:
-                        json.dumps(obj)
-                        return obj
-                    except (TypeError, ValueError):
-                        return str(obj)
-
-            serializable_data = json_serializable(self.report_data)
-            json.dump(serializable_data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            json_file.write_bytes(orjson.dumps(
+                self.report_data,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            json_file.write_text(
+                json.dumps(self.report_data, indent=2, ensure_ascii=False, default=_json_default),
+                encoding='utf-8'
+            )
+
+        # 기계 소비자(CI 등)는 JSON만 사용하므로 텍스트 요약 생략 가능
+        if os.getenv("SKIP_TXT_SUMMARY"):
+            self._console_handler.flush()
+            return {"json_report": str(json_file), "console_log": str(self.console_log_file)}
 
         # 2. 텍스트 요약 보고서 저장
         txt_file = reports_dir / f"{base_filename}_summary.txt"
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("통합 PDF 처리 파이프라인 테스트 보고서\n")
-            f.write("=" * 80 + "\n\n")
-
-            f.write(f"🕐 테스트 시간: {self.timestamp}\n")
-            f.write("\n")
-
-            f.write("💻 시스템 정보:\n")
-            system_info = self.report_data["system_info"]
-            if system_info:
-                memory_info = system_info.get("memory", {})
-                cpu_info = system_info.get("cpu", {})
-                f.write(f"   - 총 메모리: {memory_info.get('total_mb', 0):.1f} MB\n")
-                f.write(f"   - 사용 가능 메모리: {memory_info.get('available_mb', 0):.1f} MB\n")
-                f.write(f"   - CPU 사용률: {cpu_info.get('usage_percent', 0):.1f}%\n")
-                f.write(f"   - CPU 코어 수: {cpu_info.get('count', 0)}\n")
-            f.write("\n")
-
-            f.write("🧪 파이프라인 테스트 결과:\n")
-            for test_name, result in self.report_data["pipeline_tests"].items():
-                status = "✅ 성공" if result.get("success", False) else "❌ 실패"
-                f.write(f"   {status} {test_name}:\n")
-                f.write(f"     - 처리 시간: {result.get('processing_time', 0):.2f}초\n")
-                if result.get("error_message"):
-                    f.write(f"     - 오류: {result['error_message']}\n")
-                f.write(f"     - 완료된 스테이지: {len(result.get('stages_completed', []))}\n")
-            f.write("\n")
-
-            f.write("📊 성능 분석:\n")
-            perf_analysis = self.report_data["performance_analysis"]
-            if perf_analysis:
-                f.write(f"   - 평균 처리 시간: {perf_analysis.get('avg_processing_time', 0):.2f}초\n")
-                f.write(f"   - 최대 메모리 사용량: {perf_analysis.get('peak_memory_mb', 0):.1f} MB\n")
-                f.write(f"   - 전체 성공률: {perf_analysis.get('success_rate', 0):.1f}%\n")
-                f.write(f"   - 성능 등급: {perf_analysis.get('performance_grade', 'N/A')}\n")
-            f.write("\n")
-
-            f.write("🔍 권장사항:\n")
-            for rec in self.report_data["recommendations"]:
-                f.write(f"   - {rec}\n")
-            f.write("\n")
-
-            f.write("=" * 80 + "\n")
-            f.write("콘솔 출력 로그:\n")
-            f.write("=" * 80 + "\n")
-            for line in self.console_output:
-                f.write(line + "\n")
-
-        return {"json_report": str(json_file), "txt_summary": str(txt_file)}
+        parts: List[str] = []
+        parts.append("=" * 80 + "\n")
+        parts.append("통합 PDF 처리 파이프라인 테스트 보고서\n")
+        parts.append("=" * 80 + "\n\n")
+
+        parts.append(f"🕐 테스트 시간: {self.timestamp}\n")
+        parts.append("\n")
+
+        parts.append("💻 시스템 정보:\n")
+        system_info = self.report_data["system_info"]
+        if system_info:
+            memory_info = system_info.get("memory", {})
+            cpu_info = system_info.get("cpu", {})
+            parts.append(f"   - 총 메모리: {memory_info.get('total_mb', 0):.1f} MB\n")
+            parts.append(f"   - 사용 가능 메모리: {memory_info.get('available_mb', 0):.1f} MB\n")
+            parts.append(f"   - CPU 사용률: {cpu_info.get('usage_percent', 0):.1f}%\n")
+            parts.append(f"   - CPU 코어 수: {cpu_info.get('count', 0)}\n")
+        parts.append("\n")
+
+        parts.append("🧪 파이프라인 테스트 결과:\n")
+        for test_name, result in self.report_data["pipeline_tests"].items():
+            status = "✅ 성공" if result.get("success", False) else "❌ 실패"
+            parts.append(f"   {status} {test_name}:\n")
+            parts.append(f"     - 처리 시간: {result.get('processing_time', 0):.2f}초\n")
+            if result.get("error_message"):
+                parts.append(f"     - 오류: {result['error_message']}\n")
+            parts.append(f"     - 완료된 스테이지: {len(result.get('stages_completed', []))}\n")
+        parts.append("\n")
+
+        parts.append("📊 성능 분석:\n")
+        perf_analysis = self.report_data["performance_analysis"]
+        if perf_analysis:
+            parts.append(f"   - 평균 처리 시간: {perf_analysis.get('avg_processing_time', 0):.2f}초\n")
+            parts.append(
+                f"   - 처리 시간 p50/p95/p99: {perf_analysis.get('p50_processing_time', 0):.2f}/"
+                f"{perf_analysis.get('p95_processing_time', 0):.2f}/"
+                f"{perf_analysis.get('p99_processing_time', 0):.2f}초\n"
+            )
+            parts.append(f"   - 최대 메모리 사용량: {perf_analysis.get('peak_memory_mb', 0):.1f} MB\n")
+            parts.append(f"   - 전체 성공률: {perf_analysis.get('success_rate', 0):.1f}%\n")
+            parts.append(f"   - 성능 등급: {perf_analysis.get('performance_grade', 'N/A')}\n")
+        parts.append("\n")
+
+        parts.append("🔍 권장사항:\n")
+        for rec in self.report_data["recommendations"]:
+            parts.append(f"   - {rec}\n")
+        parts.append("\n")
+
+        parts.append(f"📜 콘솔 출력 로그: {self.console_log_file}\n")
+
+        with open(txt_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(parts)
+
+        self._console_handler.flush()
+
+        return {
+            "json_report": str(json_file),
+            "txt_summary": str(txt_file),
+            "console_log": str(self.console_log_file)
+        }
+
+TEST_FILE = "uploads/pdf/test_policy.pdf"
+
+@lru_cache(maxsize=1)
+def _prepare_test_file() -> str:
+    """테스트 PDF 준비 (프로세스당 한 번만 확인, 없으면 더미 파일 생성)"""
+    Path(TEST_FILE).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(TEST_FILE, 'x') as f:
+            f.write("dummy pdf content for testing")
+    except FileExistsError:
+        pass
+    return TEST_FILE
+
+@lru_cache(maxsize=8)
+def _pipeline(mode: PipelineMode, parallel: bool, timeout: int,
+              tables: bool = True, images: bool = True) -> PDFProcessingPipeline:
+    """설정별 파이프라인 캐시 (에이전트 초기화는 설정당 한 번만 수행)"""
+    return PDFProcessingPipeline(PipelineConfig(
+        mode=mode,
+        enable_table_extraction=tables,
+        enable_image_extraction=images,
+        parallel_processing=parallel,
+        timeout_seconds=timeout
+    ))
+
+@lru_cache(maxsize=1)
+def _supervisor() -> SupervisorAgent:
+    """모듈 전역 SupervisorAgent 싱글톤"""
+    return SupervisorAgent()
 
 async def test_standard_pipeline():
     """표준 파이프라인 테스트"""
     logger.info("표준 파이프라인 테스트 시작")
     
-    config = PipelineConfig(
-        mode=PipelineMode.STANDARD,
-        parallel_processing=False,
-        timeout_seconds=120
-    )
-    
-    pipeline = PDFProcessingPipeline(config)
-    test_file = "uploads/pdf/test_policy.pdf"
-    
-    # 더미 파일이 없으면 생성
-    if not os.path.exists(test_file):
-        os.makedirs(os.path.dirname(test_file), exist_ok=True)
-        with open(test_file, 'w') as f:
-            f.write("dummy pdf content for testing")
+    pipeline = _pipeline(PipelineMode.STANDARD, parallel=False, timeout=120)
+    test_file = _prepare_test_file()
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     try:
         result = await pipeline.process_document(test_file, policy_id=1)
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         return {
             "success": result.success,
@@ -188,7 +244,7 @@ async def test_standard_pipeline():
             "performance_metrics": result.performance_metrics
         }
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         return {
             "success": False,
             "processing_time": processing_time,
@@ -201,21 +257,13 @@ async def test_fast_pipeline():
     """고속 파이프라인 테스트"""
     logger.info("고속 파이프라인 테스트 시작")
     
-    config = PipelineConfig(
-        mode=PipelineMode.FAST,
-        enable_table_extraction=False,
-        enable_image_extraction=False,
-        parallel_processing=False,
-        timeout_seconds=60
-    )
-    
-    pipeline = PDFProcessingPipeline(config)
-    test_file = "uploads/pdf/test_policy.pdf"
+    pipeline = _pipeline(PipelineMode.FAST, parallel=False, timeout=60, tables=False, images=False)
+    test_file = _prepare_test_file()
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     try:
         result = await pipeline.process_document(test_file, policy_id=2)
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         return {
             "success": result.success,
@@ -225,7 +273,7 @@ async def test_fast_pipeline():
             "performance_metrics": result.performance_metrics
         }
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         return {
             "success": False,
             "processing_time": processing_time,
@@ -238,19 +286,13 @@ async def test_parallel_pipeline():
     """병렬 처리 파이프라인 테스트"""
     logger.info("병렬 처리 파이프라인 테스트 시작")
     
-    config = PipelineConfig(
-        mode=PipelineMode.STANDARD,
-        parallel_processing=True,
-        timeout_seconds=180
-    )
-    
-    pipeline = PDFProcessingPipeline(config)
-    test_file = "uploads/pdf/test_policy.pdf"
+    pipeline = _pipeline(PipelineMode.STANDARD, parallel=True, timeout=180)
+    test_file = _prepare_test_file()
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     try:
         result = await pipeline.process_document(test_file, policy_id=3)
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         return {
             "success": result.success,
@@ -260,7 +302,7 @@ async def test_parallel_pipeline():
             "performance_metrics": result.performance_metrics
         }
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         return {
             "success": False,
             "processing_time": processing_time,
@@ -273,17 +315,17 @@ async def test_supervisor_integration():
     """SupervisorAgent 통합 테스트"""
     logger.info("SupervisorAgent 통합 테스트 시작")
     
-    supervisor = SupervisorAgent()
-    test_file = "uploads/pdf/test_policy.pdf"
+    supervisor = _supervisor()
+    test_file = _prepare_test_file()
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     try:
         result = await supervisor.process_document_with_pipeline(
             test_file, 
             policy_id=4, 
             pipeline_mode="STANDARD"
         )
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         return {
             "success": result.get("status") != "failed",
@@ -293,7 +335,7 @@ async def test_supervisor_integration():
             "performance_metrics": result.get("pipeline_result", {}).get("performance_metrics", {})
         }
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         return {
             "success": False,
             "processing_time": processing_time,
@@ -302,18 +344,41 @@ async def test_supervisor_integration():
             "performance_metrics": {}
         }
 
+async def run_batch(files: List[str], 
+                    mode: PipelineMode = PipelineMode.STANDARD, 
+                    max_concurrent: Optional[int] = None,
+                    on_result: Optional[Callable[[PipelineResult], None]] = None,
+                    keep_results: bool = True) -> List[PipelineResult]:
+    """여러 PDF를 동시 실행 수를 제한하여 처리 (입력 순서대로 결과 반환, on_result는 완료 즉시 호출,
+    keep_results=False면 결과를 메모리에 보관하지 않음)"""
+    if max_concurrent is None:
+        max_concurrent = math.ceil((os.cpu_count() or 1) * 1.5)
+    
+    processor = BatchProcessor(PipelineConfig(mode=mode))
+    return await processor.process_multiple_files(
+        files, max_concurrent=max_concurrent, on_result=on_result, keep_results=keep_results
+    )
+
 def analyze_performance(test_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     """성능 분석"""
     successful_tests = {k: v for k, v in test_results.items() if v["success"]}
     failed_tests = {k: v for k, v in test_results.items() if not v["success"]}
     
     if successful_tests:
-        processing_times = [t["processing_time"] for t in successful_tests.values()]
-        avg_processing_time = sum(processing_times) / len(processing_times)
-        max_processing_time = max(processing_times)
-        min_processing_time = min(processing_times)
+        processing_times = np.fromiter(
+            (t["processing_time"] for t in successful_tests.values()),
+            dtype=np.float64,
+            count=len(successful_tests)
+        )
+        avg_processing_time = float(processing_times.mean())
+        max_processing_time = float(processing_times.max())
+        min_processing_time = float(processing_times.min())
+        p50_processing_time, p95_processing_time, p99_processing_time = (
+            np.percentile(processing_times, [50, 95, 99]).tolist()
+        )
     else:
         avg_processing_time = max_processing_time = min_processing_time = 0
+        p50_processing_time = p95_processing_time = p99_processing_time = 0
     
     # 메모리 사용량 분석 (성능 메트릭에서 추출)
     peak_memory_mb = 0
@@ -342,6 +407,9 @@ def analyze_performance(test_results: Dict[str, Dict[str, Any]]) -> Dict[str, An
         "avg_processing_time": avg_processing_time,
         "max_processing_time": max_processing_time,
         "min_processing_time": min_processing_time,
+        "p50_processing_time": p50_processing_time,
+        "p95_processing_time": p95_processing_time,
+        "p99_processing_time": p99_processing_time,
         "peak_memory_mb": peak_memory_mb,
         "performance_grade": performance_grade
     }
@@ -384,75 +452,140 @@ async def run_integrated_pipeline_tests():
     logger.info("=" * 60)
 
     report = IntegratedPipelineReport()
-    
-    # 시스템 상태 확인
-    system_status = ResourceOptimizer.get_system_status()
-    report.set_system_info(system_status)
-    report.log_console(f"💻 시스템 상태: 메모리 {system_status['memory']['used_percent']:.1f}% 사용 중")
-
-    # 테스트 실행
-    test_functions = {
-        "standard_pipeline": test_standard_pipeline,
-        "fast_pipeline": test_fast_pipeline,
-        "parallel_pipeline": test_parallel_pipeline,
-        "supervisor_integration": test_supervisor_integration
-    }
+    try:
+        # 시스템 상태 확인
+        system_status = ResourceOptimizer.get_system_status()
+        report.set_system_info(system_status)
+        report.log_console(f"💻 시스템 상태: 메모리 {system_status['memory']['used_percent']:.1f}% 사용 중")
+
+        # 테스트 실행
+        test_functions = {
+            "standard_pipeline": test_standard_pipeline,
+            "fast_pipeline": test_fast_pipeline,
+            "parallel_pipeline": test_parallel_pipeline,
+            "supervisor_integration": test_supervisor_integration
+        }
+
+        # 서로 독립적인 테스트들을 동시에 실행 (테스트별 타임아웃 적용)
+        test_names = list(test_functions)
+        raw_results = await asyncio.gather(
+            *[asyncio.wait_for(test_func(), timeout=300) for test_func in test_functions.values()],
+            return_exceptions=True
+        )
 
-    test_results = {}
+        # 콘솔 로그는 정의 순서대로 기록
+        test_results = {}
     
-    for test_name, test_func in test_functions.items():
-        report.log_console(f"\n🧪 {test_name} 테스트 실행 중...")
-        try:
-            result = await test_func()
+        for test_name, result in zip(test_names, raw_results):
+            report.log_console(f"\n🧪 {test_name} 테스트 실행 중...")
+            if isinstance(result, BaseException):
+                test_results[test_name] = {
+                    "success": False,
+                    "processing_time": 0,
+                    "stages_completed": [],
+                    "error_message": str(result) or type(result).__name__,
+                    "performance_metrics": {}
+                }
+                report.log_console(f"❌ {test_name} 테스트 실행 실패: {result!r}")
+                continue
+        
             test_results[test_name] = result
             status = "✅ 성공" if result["success"] else "❌ 실패"
             report.log_console(f"{status} {test_name}: {result['processing_time']:.2f}초")
             if result.get("error_message"):
                 report.log_console(f"   오류: {result['error_message']}")
-        except Exception as e:
-            test_results[test_name] = {
-                "success": False,
-                "processing_time": 0,
-                "stages_completed": [],
-                "error_message": str(e),
-                "performance_metrics": {}
+
+        # 결과를 보고서에 추가
+        for test_name, result in test_results.items():
+            report.add_pipeline_test(test_name, result)
+
+        # 성능 분석
+        performance_analysis = analyze_performance(test_results)
+        report.set_performance_analysis(performance_analysis)
+
+        # 권장사항 생성
+        recommendations = generate_recommendations(system_status, performance_analysis, test_results)
+        for rec in recommendations:
+            report.add_recommendation(rec)
+
+        # 결과 요약 출력
+        report.log_console("\n" + "=" * 60)
+        report.log_console("테스트 결과 요약")
+        report.log_console("=" * 60)
+        report.log_console(f"📊 전체 테스트: {performance_analysis['total_tests']}개")
+        report.log_console(f"✅ 성공: {performance_analysis['successful_tests']}개")
+        report.log_console(f"❌ 실패: {performance_analysis['failed_tests']}개")
+        report.log_console(f"📈 성공률: {performance_analysis['success_rate']:.1f}%")
+        report.log_console(f"⏱️ 평균 처리 시간: {performance_analysis['avg_processing_time']:.2f}초")
+        report.log_console(f"🏆 성능 등급: {performance_analysis['performance_grade']}")
+
+        # 보고서 저장
+        report.log_console("\n💾 보고서 저장 중...")
+        saved_files = report.save_reports()
+        report.log_console("✅ 보고서 저장 완료!")
+        report.log_console(f"   - JSON 상세 보고서: {saved_files['json_report']}")
+        if "txt_summary" in saved_files:
+            report.log_console(f"   - TXT 요약 보고서: {saved_files['txt_summary']}")
+        report.log_console(f"   - 콘솔 로그: {saved_files['console_log']}")
+
+        logger.info("\n" + "=" * 60)
+        logger.info("Task 3.6 통합 테스트 완료")
+        logger.info("=" * 60)
+    finally:
+        report.close()
+
+async def run_batch_tests(files: List[str]):
+    """명령행으로 전달된 PDF 파일들의 배치 처리 테스트 (결과는 완료 순서대로 JSONL로 기록)"""
+    logger.info(f"배치 처리 테스트 시작: {len(files)}개 파일")
+    
+    reports_dir = Path("reports/integrated_pipeline")
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    jsonl_file = reports_dir / f"batch_pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    
+    # 메모리에는 집계용 카운터만 유지
+    totals = {"count": 0, "success": 0, "processing_time": 0.0}
+    
+    with open(jsonl_file, 'ab', buffering=1 << 20) as fh:
+        def write_result(result: PipelineResult):
+            row = {
+                "name": result.file_path,
+                "success": result.success,
+                "processing_time": result.processing_time,
+                "stages_completed": result.stages_completed,
+                "error_message": result.error_message,
+                "warnings": result.warnings,
+                "performance_metrics": result.performance_metrics
             }
-            report.log_console(f"❌ {test_name} 테스트 실행 실패: {e}")
-
-    # 결과를 보고서에 추가
-    for test_name, result in test_results.items():
-        report.add_pipeline_test(test_name, result)
-
-    # 성능 분석
-    performance_analysis = analyze_performance(test_results)
-    report.set_performance_analysis(performance_analysis)
-
-    # 권장사항 생성
-    recommendations = generate_recommendations(system_status, performance_analysis, test_results)
-    for rec in recommendations:
-        report.add_recommendation(rec)
-
-    # 결과 요약 출력
-    report.log_console("\n" + "=" * 60)
-    report.log_console("테스트 결과 요약")
-    report.log_console("=" * 60)
-    report.log_console(f"📊 전체 테스트: {performance_analysis['total_tests']}개")
-    report.log_console(f"✅ 성공: {performance_analysis['successful_tests']}개")
-    report.log_console(f"❌ 실패: {performance_analysis['failed_tests']}개")
-    report.log_console(f"📈 성공률: {performance_analysis['success_rate']:.1f}%")
-    report.log_console(f"⏱️ 평균 처리 시간: {performance_analysis['avg_processing_time']:.2f}초")
-    report.log_console(f"🏆 성능 등급: {performance_analysis['performance_grade']}")
-
-    # 보고서 저장
-    report.log_console("\n💾 보고서 저장 중...")
-    saved_files = report.save_reports()
-    report.log_console("✅ 보고서 저장 완료!")
-    report.log_console(f"   - JSON 상세 보고서: {saved_files['json_report']}")
-    report.log_console(f"   - TXT 요약 보고서: {saved_files['txt_summary']}")
-
-    logger.info("\n" + "=" * 60)
-    logger.info("Task 3.6 통합 테스트 완료")
-    logger.info("=" * 60)
+            if ORJSON_AVAILABLE:
+                fh.write(orjson.dumps(
+                    row,
+                    default=_json_default,
+                    option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                ))
+            else:
+                fh.write((json.dumps(row, ensure_ascii=False, default=_json_default) + "\n").encode('utf-8'))
+            
+            totals["count"] += 1
+            totals["success"] += result.success
+            totals["processing_time"] += result.processing_time
+            
+            status = "✅ 성공" if result.success else "❌ 실패"
+            print(f"{status} {result.file_path}: {result.processing_time:.2f}초")
+            if result.error_message:
+                print(f"   오류: {result.error_message}")
+        
+        start_ns = time.perf_counter_ns()
+        await run_batch(files, on_result=write_result, keep_results=False)
+        total_time = (time.perf_counter_ns() - start_ns) / 1e9
+    
+    avg_time = totals["processing_time"] / totals["count"] if totals["count"] else 0
+    print(f"\n📊 배치 처리: {totals['success']}/{totals['count']}개 성공, "
+          f"평균 {avg_time:.2f}초, 전체 {total_time:.2f}초")
+    print(f"📄 결과 스트림: {jsonl_file}")
 
 if __name__ == "__main__":
-    asyncio.run(run_integrated_pipeline_tests())
+    # 사용법: python test_integrated_pipeline.py [file1.pdf file2.pdf ...]
+    if len(sys.argv) > 1:
+        asyncio.run(run_batch_tests(sys.argv[1:]))
+    else:
+        asyncio.run(run_integrated_pipeline_tests())
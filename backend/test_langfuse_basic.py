@@ -6,13 +6,20 @@ import os
 import sys
 from dotenv import load_dotenv
 
-# 환경 변수 로드
+# 환경 변수 로드 (한 번만 읽어 재사용)
 load_dotenv()
+secret_key = os.environ.get('LANGFUSE_SECRET_KEY')
+public_key = os.environ.get('LANGFUSE_PUBLIC_KEY')
+host = os.environ.get('LANGFUSE_HOST')
 
-print("🔍 LangFuse 환경 변수 확인:")
-print(f"LANGFUSE_SECRET_KEY: {'설정됨' if os.getenv('LANGFUSE_SECRET_KEY') else '미설정'}")
-print(f"LANGFUSE_PUBLIC_KEY: {'설정됨' if os.getenv('LANGFUSE_PUBLIC_KEY') else '미설정'}")
-print(f"LANGFUSE_HOST: {os.getenv('LANGFUSE_HOST', '기본값')}")
+# 진단 배너는 한 번의 write로 출력
+_out = [
+    "🔍 LangFuse 환경 변수 확인:",
+    f"LANGFUSE_SECRET_KEY: {'설정됨' if secret_key else '미설정'}",
+    f"LANGFUSE_PUBLIC_KEY: {'설정됨' if public_key else '미설정'}",
+    f"LANGFUSE_HOST: {host if host is not None else '기본값'}",
+]
+sys.stdout.write("\n".join(_out) + "\n")
 
 try:
     # SSL 경고 비활성화 (개발 환경용)
@@ -23,16 +30,12 @@ try:
     print("✅ LangFuse 모듈 import 성공")
     
     # 클라이언트 생성 테스트
-    secret_key = os.getenv('LANGFUSE_SECRET_KEY')
-    public_key = os.getenv('LANGFUSE_PUBLIC_KEY')
-    host = os.getenv('LANGFUSE_HOST', 'https://cloud.langfuse.com')
-    
     if secret_key and public_key:
         print("🔗 LangFuse 클라이언트 생성 시도...")
         client = Langfuse(
             secret_key=secret_key,
             public_key=public_key,
-            host=host
+            host=host if host is not None else 'https://cloud.langfuse.com'
         )
         print("✅ LangFuse 클라이언트 생성 성공")
         
@@ -50,10 +53,13 @@ except ImportError as e:
 except Exception as e:
     print(f"❌ LangFuse 테스트 실패: {e}")
 
-print("\n📋 LangFuse 설정 가이드:")
-print("1. https://langfuse.com 에서 계정 생성")
-print("2. 새 프로젝트 생성")
-print("3. Settings > API Keys에서 키 복사")
-print("4. .env 파일에 실제 키 설정:")
-print("   LANGFUSE_SECRET_KEY=sk-lf-실제키")
-print("   LANGFUSE_PUBLIC_KEY=pk-lf-실제키")
+_out = [
+    "\n📋 LangFuse 설정 가이드:",
+    "1. https://langfuse.com 에서 계정 생성",
+    "2. 새 프로젝트 생성",
+    "3. Settings > API Keys에서 키 복사",
+    "4. .env 파일에 실제 키 설정:",
+    "   LANGFUSE_SECRET_KEY=sk-lf-실제키",
+    "   LANGFUSE_PUBLIC_KEY=pk-lf-실제키",
+]
+sys.stdout.write("\n".join(_out) + "\n")
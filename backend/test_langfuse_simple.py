@@ -4,14 +4,18 @@ LangFuse 최소 기능 테스트 (SSL 우회)
 """
 import os
 import ssl
+import sys
 import urllib3
 from dotenv import load_dotenv
 
 # SSL 경고 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# 환경 변수 로드
+# 환경 변수 로드 (한 번만 읽어 재사용)
 load_dotenv()
+secret_key = os.environ.get('LANGFUSE_SECRET_KEY')
+public_key = os.environ.get('LANGFUSE_PUBLIC_KEY')
+host = os.environ.get('LANGFUSE_HOST', 'https://cloud.langfuse.com')
 
 print("🔍 LangFuse 최소 기능 테스트 (SSL 우회)")
 
@@ -20,13 +24,11 @@ try:
     print("✅ LangFuse 모듈 import 성공")
     
     # 환경 변수 확인
-    secret_key = os.getenv('LANGFUSE_SECRET_KEY')
-    public_key = os.getenv('LANGFUSE_PUBLIC_KEY')
-    host = os.getenv('LANGFUSE_HOST', 'https://cloud.langfuse.com')
-    
-    print(f"🔑 Secret Key: {'설정됨' if secret_key else '미설정'}")
-    print(f"🔑 Public Key: {'설정됨' if public_key else '미설정'}")
-    print(f"🌐 Host: {host}")
+    sys.stdout.write(
+        f"🔑 Secret Key: {'설정됨' if secret_key else '미설정'}\n"
+        f"🔑 Public Key: {'설정됨' if public_key else '미설정'}\n"
+        f"🌐 Host: {host}\n"
+    )
     
     if secret_key and public_key:
         print("\n🔗 LangFuse 클라이언트 생성 (SSL 검증 우회)...")
@@ -71,8 +73,8 @@ try:
 except Exception as e:
     print(f"❌ 오류 발생: {e}")
 
-print("\n✅ 테스트 완료")
-print("💡 SSL 인증서 문제가 있는 환경에서는 이 방식을 사용하세요.")
+sys.stdout.write("\n✅ 테스트 완료\n"
+                 "💡 SSL 인증서 문제가 있는 환경에서는 이 방식을 사용하세요.\n")
 
 
 
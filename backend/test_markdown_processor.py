@@ -2,25 +2,56 @@
 Task 3.5 Markdown 변환 및 구조 보존 테스트
 """
 import asyncio
+import copy
 import os
 import json
 import logging
+from enum import Enum
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 from dotenv import load_dotenv
 
 from agents.markdown_processor import MarkdownProcessorAgent
 from agents.base import DocumentProcessingState, ProcessingStatus
 
+# 변환기가 이미지 처리 시 지연 import하는 모듈을 미리 로드 (첫 변환 호출의 import 비용 제거)
+try:
+    from PIL import Image, ImageDraw, ImageFont  # noqa: F401
+except ImportError:
+    pass
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+_RULE = "=" * 60  # 로그 구분선 (한 번만 생성)
 
 # .env 파일 로드
 load_dotenv()
 
+class _SafeEncoder(json.JSONEncoder):
+    """JSON 기본 직렬화 불가 객체 변환 (Enum → value, 객체 → __dict__, 그 외 → str)"""
+
+    def default(self, o):
+        if isinstance(o, Enum):
+            return o.value
+        if isinstance(o, (bytes, datetime, Path)):
+            return str(o)
+        if hasattr(o, '__dict__'):
+            return _replace_nan(o.__dict__)
+        return str(o)
+
+def _replace_nan(obj):
+    """NaN을 None으로 치환 (float만 검사, 컨테이너는 재귀 처리)"""
+    if isinstance(obj, float):
+        return None if obj != obj else obj
+    if isinstance(obj, dict):
+        return {k: _replace_nan(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_nan(item) for item in obj]
+    return obj
+
 class MarkdownProcessingReport:
     """Markdown 변환 처리 결과 보고서"""
 
@@ -47,12 +78,12 @@ class MarkdownProcessingReport:
         self.console_output.append(message)
         print(message)
 
-    def set_pdf_info(self, total_pages: int, file_size: str):
-        """PDF 기본 정보 설정"""
+    def set_pdf_info(self, total_pages: int, file_size: str, file_exists: bool):
+        """PDF 기본 정보 설정 (파일 존재 여부는 호출 측의 stat 결과 재사용)"""
         self.report_data["pdf_info"] = {
             "total_pages": total_pages,
             "file_size": file_size,
-            "file_exists": os.path.exists(self.test_pdf_path)
+            "file_exists": file_exists
         }
 
     def set_conversion_stats(self, stats: Dict[str, Any]):
@@ -81,185 +112,177 @@ class MarkdownProcessingReport:
 
         # 1. JSON 상세 보고서 저장
         json_file = reports_dir / f"{base_filename}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            def json_serializable(obj):
-                """JSON 직렬화 가능한 형태로 변환"""
-                if hasattr(obj, 'value'):  # Enum 객체
-                    return obj.value
-                if isinstance(obj, dict):
-                    return {k: json_serializable(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [json_serializable(item) for item in obj]
-                elif hasattr(obj, '__dict__'):
-                    return json_serializable(obj.__dict__)
-                elif obj is None or (hasattr(obj, '__ne__') and obj != obj):  # NaN 체크
-                    return None
-                else:
-                    try:
-                        json.dumps(obj)  # 직렬화 가능한지 테스트
-                        return obj
-                    except (TypeError, ValueError):
-                        return str(obj)
-
-            serializable_data = json_serializable(self.report_data)
-            json.dump(serializable_data, f, indent=2, ensure_ascii=False)
+        try:
+            json_text = json.dumps(self.report_data, indent=2, ensure_ascii=False, cls=_SafeEncoder, allow_nan=False)
+        except ValueError:
+            # NaN/Infinity가 있는 경우에만 NaN → null 치환 후 다시 직렬화
+            json_text = json.dumps(_replace_nan(self.report_data), indent=2, ensure_ascii=False, cls=_SafeEncoder)
+        json_file.write_text(json_text, encoding='utf-8')
+
+        # 콘솔 로그는 한 번만 합쳐 요약 보고서와 로그 파일에 함께 사용
+        console_text = "".join(line + "\n" for line in self.console_output)
 
         # 2. 텍스트 요약 보고서 저장
         txt_file = reports_dir / f"{base_filename}_summary.txt"
+        out: List[str] = []
+        out.append("=" * 80 + "\n")
+        out.append("Markdown 변환 및 구조 보존 테스트 보고서\n")
+        out.append("=" * 80 + "\n\n")
+
+        out.append(f"📄 테스트 파일: {self.test_pdf_path}\n")
+        out.append(f"🕐 테스트 시간: {self.timestamp}\n")
+        out.append(f"✅ 전체 상태: {self.report_data['overall_status']}\n")
+        if self.report_data['error_message']:
+            out.append(f"❌ 오류 메시지: {self.report_data['error_message']}\n")
+        out.append("\n")
+
+        out.append("📖 PDF 기본 정보:\n")
+        out.extend(f"   - {k}: {v}\n" for k, v in self.report_data["pdf_info"].items())
+        out.append("\n")
+
+        out.append("📊 변환 통계:\n")
+        out.extend(f"   - {k}: {v}\n" for k, v in self.report_data["conversion_stats"].items())
+        out.append("\n")
+
+        out.append("🔍 품질 검증 결과:\n")
+        quality = self.report_data["quality_validation"]
+        if quality:
+            out.append(f"   - 전체 통과: {quality.get('overall_passed', False)}\n")
+            out.append(f"   - 점수: {quality.get('score', 0):.1f}점\n")
+            if quality.get('issues'):
+                out.append("   - 문제점:\n")
+                for issue in quality['issues']:
+                    out.append(f"     * {issue}\n")
+            
+            out.append("   - 세부 결과:\n")
+            out.extend(
+                f"     {'✅' if result['passed'] else '❌'} {result['description']}: {result['score']}\n"
+                for result in quality.get('detailed_results', {}).values()
+            )
+        out.append("\n")
+
+        out.append("📁 출력 파일:\n")
+        out.extend(f"   - {k}: {v}\n" for k, v in self.report_data["output_files"].items())
+        out.append("\n")
+
+        out.append("=" * 80 + "\n")
+        out.append("콘솔 출력 로그:\n")
+        out.append("=" * 80 + "\n")
+        out.append(console_text)
+
         with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("Markdown 변환 및 구조 보존 테스트 보고서\n")
-            f.write("=" * 80 + "\n\n")
-
-            f.write(f"📄 테스트 파일: {self.test_pdf_path}\n")
-            f.write(f"🕐 테스트 시간: {self.timestamp}\n")
-            f.write(f"✅ 전체 상태: {self.report_data['overall_status']}\n")
-            if self.report_data['error_message']:
-                f.write(f"❌ 오류 메시지: {self.report_data['error_message']}\n")
-            f.write("\n")
-
-            f.write("📖 PDF 기본 정보:\n")
-            for k, v in self.report_data["pdf_info"].items():
-                f.write(f"   - {k}: {v}\n")
-            f.write("\n")
-
-            f.write("📊 변환 통계:\n")
-            for k, v in self.report_data["conversion_stats"].items():
-                f.write(f"   - {k}: {v}\n")
-            f.write("\n")
-
-            f.write("🔍 품질 검증 결과:\n")
-            quality = self.report_data["quality_validation"]
-            if quality:
-                f.write(f"   - 전체 통과: {quality.get('overall_passed', False)}\n")
-                f.write(f"   - 점수: {quality.get('score', 0):.1f}점\n")
-                if quality.get('issues'):
-                    f.write("   - 문제점:\n")
-                    for issue in quality['issues']:
-                        f.write(f"     * {issue}\n")
-                
-                f.write("   - 세부 결과:\n")
-                for test_name, result in quality.get('detailed_results', {}).items():
-                    status = "✅" if result['passed'] else "❌"
-                    f.write(f"     {status} {result['description']}: {result['score']}\n")
-            f.write("\n")
-
-            f.write("📁 출력 파일:\n")
-            for k, v in self.report_data["output_files"].items():
-                f.write(f"   - {k}: {v}\n")
-            f.write("\n")
-
-            f.write("=" * 80 + "\n")
-            f.write("콘솔 출력 로그:\n")
-            f.write("=" * 80 + "\n")
-            for line in self.console_output:
-                f.write(line + "\n")
+            f.write("".join(out))
 
         # 3. 콘솔 로그 파일 저장
         log_file = reports_dir / f"{base_filename}_console.log"
-        with open(log_file, 'w', encoding='utf-8') as f:
-            for line in self.console_output:
-                f.write(line + "\n")
+        log_file.write_text(console_text, encoding='utf-8')
 
         return {"json_report": str(json_file), "txt_summary": str(txt_file), "console_log": str(log_file)}
 
-def create_sample_processed_chunks() -> List[Dict[str, Any]]:
-    """테스트용 샘플 처리된 청크 생성"""
-    return [
-        {
-            "text": "보험약관 제1장 총칙",
-            "metadata": {
-                "chunk_index": 0,
-                "page_number": 1,
-                "chunk_type": "text",
-                "source": "text_extraction",
-                "font_size": 16,
-                "bbox": [100, 700, 400, 720]
-            }
-        },
-        {
-            "text": "제1조 (목적) 이 약관은 보험회사와 보험계약자 간의 권리와 의무를 규정함을 목적으로 합니다.",
-            "metadata": {
-                "chunk_index": 1,
-                "page_number": 1,
-                "chunk_type": "text",
-                "source": "text_extraction",
-                "font_size": 12,
-                "bbox": [100, 650, 500, 680]
-            }
-        },
-        {
-            "text": "제2조 (정의) 이 약관에서 사용하는 용어의 정의는 다음과 같습니다.\n1. 보험계약자: 보험회사와 보험계약을 체결하는 자\n2. 피보험자: 보험사고의 대상이 되는 자",
-            "metadata": {
-                "chunk_index": 2,
-                "page_number": 1,
-                "chunk_type": "text",
-                "source": "text_extraction",
-                "font_size": 12,
-                "bbox": [100, 580, 500, 640]
-            }
-        },
-        {
-            "text": "",
-            "metadata": {
-                "chunk_index": 3,
-                "page_number": 2,
-                "chunk_type": "table",
-                "source": "table_extraction",
-                "table_data": [
-                    ["구분", "보장내용", "보험금액"],
-                    ["상해사망", "상해로 인한 사망 시", "1억원"],
-                    ["상해후유장해", "상해로 인한 후유장해 시", "장해정도에 따라"],
-                    ["질병사망", "질병으로 인한 사망 시", "5천만원"]
-                ]
-            }
-        },
-        {
-            "text": "보험 가입 절차 안내 이미지",
-            "metadata": {
-                "chunk_index": 4,
-                "page_number": 3,
-                "chunk_type": "image",
-                "source": "image_extraction",
-                "image_index": 0,
-                "image_analysis": {
-                    "quality": "good",
-                    "image_type": "diagram",
-                    "confidence": 0.85
-                },
-                "image_data": b"dummy_image_data"
-            }
-        },
-        {
-            "text": "* 주의사항: 보험료 납입이 연체될 경우 보험계약이 해지될 수 있습니다.",
-            "metadata": {
-                "chunk_index": 5,
-                "page_number": 3,
-                "chunk_type": "text",
-                "source": "text_extraction",
-                "font_size": 10,
-                "bbox": [100, 200, 450, 220]
-            }
+# 테스트용 샘플 청크 (모듈 로드 시 한 번만 생성)
+_SAMPLE_CHUNKS: Tuple[Dict[str, Any], ...] = (
+    {
+        "text": "보험약관 제1장 총칙",
+        "metadata": {
+            "chunk_index": 0,
+            "page_number": 1,
+            "chunk_type": "text",
+            "source": "text_extraction",
+            "font_size": 16,
+            "bbox": [100, 700, 400, 720]
+        }
+    },
+    {
+        "text": "제1조 (목적) 이 약관은 보험회사와 보험계약자 간의 권리와 의무를 규정함을 목적으로 합니다.",
+        "metadata": {
+            "chunk_index": 1,
+            "page_number": 1,
+            "chunk_type": "text",
+            "source": "text_extraction",
+            "font_size": 12,
+            "bbox": [100, 650, 500, 680]
+        }
+    },
+    {
+        "text": "제2조 (정의) 이 약관에서 사용하는 용어의 정의는 다음과 같습니다.\n1. 보험계약자: 보험회사와 보험계약을 체결하는 자\n2. 피보험자: 보험사고의 대상이 되는 자",
+        "metadata": {
+            "chunk_index": 2,
+            "page_number": 1,
+            "chunk_type": "text",
+            "source": "text_extraction",
+            "font_size": 12,
+            "bbox": [100, 580, 500, 640]
+        }
+    },
+    {
+        "text": "",
+        "metadata": {
+            "chunk_index": 3,
+            "page_number": 2,
+            "chunk_type": "table",
+            "source": "table_extraction",
+            "table_data": [
+                ["구분", "보장내용", "보험금액"],
+                ["상해사망", "상해로 인한 사망 시", "1억원"],
+                ["상해후유장해", "상해로 인한 후유장해 시", "장해정도에 따라"],
+                ["질병사망", "질병으로 인한 사망 시", "5천만원"]
+            ]
+        }
+    },
+    {
+        "text": "보험 가입 절차 안내 이미지",
+        "metadata": {
+            "chunk_index": 4,
+            "page_number": 3,
+            "chunk_type": "image",
+            "source": "image_extraction",
+            "image_index": 0,
+            "image_analysis": {
+                "quality": "good",
+                "image_type": "diagram",
+                "confidence": 0.85
+            },
+            "image_data": b"dummy_image_data"
         }
-    ]
+    },
+    {
+        "text": "* 주의사항: 보험료 납입이 연체될 경우 보험계약이 해지될 수 있습니다.",
+        "metadata": {
+            "chunk_index": 5,
+            "page_number": 3,
+            "chunk_type": "text",
+            "source": "text_extraction",
+            "font_size": 10,
+            "bbox": [100, 200, 450, 220]
+        }
+    }
+)
+
+def create_sample_processed_chunks() -> List[Dict[str, Any]]:
+    """테스트용 샘플 처리된 청크 생성 (에이전트가 수정할 수 있으므로 깊은 복사본 반환)"""
+    return copy.deepcopy(list(_SAMPLE_CHUNKS))
 
 async def test_markdown_conversion():
     """Task 3.5 Markdown 변환 및 구조 보존 테스트"""
-    logger.info("=" * 60)
-    logger.info("Task 3.5: Markdown 변환 및 구조 보존 테스트 시작")
-    logger.info("=" * 60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s\nTask 3.5: Markdown 변환 및 구조 보존 테스트 시작\n%s", _RULE, _RULE)
 
     test_pdf_path = "uploads/pdf/test_policy.pdf"
     report = MarkdownProcessingReport(test_pdf_path)
     report.log_console("📄 테스트 대상: " + test_pdf_path)
 
-    # PDF 정보 설정 (실제 파일이 없어도 테스트 진행)
-    if os.path.exists(test_pdf_path):
-        file_size_mb = os.path.getsize(test_pdf_path) / (1024 * 1024)
-        report.set_pdf_info(10, f"{file_size_mb:.2f} MB")
+    # PDF 정보 설정 (실제 파일이 없어도 테스트 진행, stat은 한 번만 호출)
+    try:
+        pdf_stat = os.stat(test_pdf_path)
+    except FileNotFoundError:
+        pdf_stat = None
+
+    if pdf_stat is not None:
+        file_size_mb = pdf_stat.st_size / (1024 * 1024)
+        report.set_pdf_info(10, f"{file_size_mb:.2f} MB", True)
         report.log_console(f"📖 파일 크기: {file_size_mb:.2f} MB")
     else:
-        report.set_pdf_info(10, "샘플 데이터")
+        report.set_pdf_info(10, "샘플 데이터", False)
         report.log_console("📖 샘플 데이터로 테스트 진행")
 
     # 테스트용 샘플 데이터 생성
@@ -303,10 +326,14 @@ async def test_markdown_conversion():
         if "quality_validation" in final_state:
             report.set_quality_validation(final_state["quality_validation"])
 
+        # 변환된 Markdown 본문과 길이 (출력 정보와 미리보기에서 재사용)
+        markdown_content = final_state.get("markdown_content") or ""
+        markdown_length = len(markdown_content)
+
         # 출력 파일 정보
         output_info = {
             "markdown_file": final_state.get("markdown_file_path"),
-            "markdown_length": len(final_state.get("markdown_content", "")),
+            "markdown_length": markdown_length,
             "extracted_images": len(final_state.get("extracted_images", []))
         }
         report.set_output_files(output_info)
@@ -340,12 +367,11 @@ async def test_markdown_conversion():
                 report.log_console(f"     * {issue}")
 
         # Markdown 내용 미리보기
-        if final_state.get("markdown_content"):
-            markdown_preview = final_state["markdown_content"][:500]
+        if markdown_length:
             report.log_console(f"\n📝 Markdown 미리보기 (처음 500자):")
             report.log_console("-" * 40)
-            report.log_console(markdown_preview)
-            if len(final_state["markdown_content"]) > 500:
+            report.log_console(markdown_content[:500])
+            if markdown_length > 500:
                 report.log_console("...")
             report.log_console("-" * 40)
 
@@ -364,10 +390,9 @@ async def test_markdown_conversion():
         report.set_overall_status(ProcessingStatus.FAILED, error_msg)
         report.save_reports()
 
-    logger.info("\n" + "=" * 60)
-    logger.info("Task 3.5 테스트 완료")
-    logger.info("=" * 60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\n%s\nTask 3.5 테스트 완료\n%s", _RULE, _RULE)
 
 if __name__ == "__main__":
-    asyncio.run(test_markdown_conversion())
+    asyncio.run(test_markdown_conversion(), debug=False)
 
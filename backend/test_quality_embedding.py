@@ -118,16 +118,14 @@ class QualityEmbeddingTestReport:
                     return obj.value
                 if isinstance(obj, dict):
                     return {k: json_serializable(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
+                elif isinstance(obj, (list, tuple)):
                     return [json_serializable(item) for item in obj]
-                elif obj is None or (hasattr(obj, '__ne__') and obj != obj):  # NaN 체크
-                    return None
+                elif isinstance(obj, float):
+                    return None if obj != obj else obj  # NaN 체크
+                elif isinstance(obj, (str, int)) or obj is None:
+                    return obj
                 else:
-                    try:
-                        json.dumps(obj)
-                        return obj
-                    except (TypeError, ValueError):
-                        return str(obj)
+                    return str(obj)
             
             serializable_data = json_serializable(self.report_data)
             json.dump(serializable_data, f, indent=2, ensure_ascii=False)
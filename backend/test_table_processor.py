@@ -15,15 +15,67 @@ import sys
 import os
 import time
 import json
+from enum import Enum
+from functools import singledispatch
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
+
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(__file__))
 
 from agents.table_processor import TableProcessorAgent
 from agents.base import DocumentProcessingState, ProcessingStatus
 
+@singledispatch
+def _json_serializable(obj):
+    """JSON 직렬화 가능한 형태로 변환 (등록되지 않은 타입: 객체는 __dict__, 그 외는 문자열)"""
+    if hasattr(obj, '__dict__'):
+        return _json_serializable(obj.__dict__)
+    return str(obj)
+
+@_json_serializable.register(dict)
+def _(obj):
+    return {k: _json_serializable(v) for k, v in obj.items()}
+
+@_json_serializable.register(list)
+@_json_serializable.register(tuple)
+def _(obj):
+    return [_json_serializable(item) for item in obj]
+
+@_json_serializable.register(str)
+@_json_serializable.register(int)
+@_json_serializable.register(type(None))
+def _(obj):
+    return obj
+
+@_json_serializable.register(float)
+def _(obj):
+    return None if obj != obj else obj  # NaN → null
+
+@_json_serializable.register(np.integer)
+@_json_serializable.register(np.floating)
+def _(obj):
+    return None if obj != obj else str(obj)  # numpy 스칼라는 문자열로 기록
+
+@_json_serializable.register(Enum)
+def _(obj):
+    return obj.value
+
+@_json_serializable.register(datetime)
+def _(obj):
+    return str(obj)
+
+try:
+    import pandas as pd
+
+    @_json_serializable.register(type(pd.NA))
+    def _(obj):
+        return None
+except ImportError:
+    pass
+
 def get_pdf_info(file_path: str) -> tuple:
     """PDF 기본 정보 반환 (총 페이지 수, 파일 크기)"""
     try:
@@ -257,27 +309,7 @@ class TableProcessingReport:
         # 1. JSON 상세 보고서 저장
         json_file = reports_dir / f"{base_filename}.json"
         with open(json_file, 'w', encoding='utf-8') as f:
-            # JSON 직렬화 가능한 데이터로 변환
-            def json_serializable(obj):
-                """JSON 직렬화 가능한 형태로 변환"""
-                if isinstance(obj, dict):
-                    return {k: json_serializable(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [json_serializable(item) for item in obj]
-                elif hasattr(obj, '__dict__'):
-                    return json_serializable(obj.__dict__)
-                elif str(type(obj)) in ['<class \'pandas._libs.missing.NAType\'>', '<class \'numpy.float64\'>', '<class \'numpy.int64\'>']:
-                    return None if str(obj) in ['<NA>', 'nan', 'NaN'] else str(obj)
-                elif obj is None or (hasattr(obj, '__ne__') and obj != obj):  # NaN 체크
-                    return None
-                else:
-                    try:
-                        json.dumps(obj)  # 직렬화 가능한지 테스트
-                        return obj
-                    except (TypeError, ValueError):
-                        return str(obj)
-            
-            serializable_data = json_serializable(self.report_data)
+            serializable_data = _json_serializable(self.report_data)
             json.dump(serializable_data, f, indent=2, ensure_ascii=False)
         
         # 2. 텍스트 요약 보고서 저장